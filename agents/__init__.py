@@ -0,0 +1,19 @@
+#Agents package - the LLM-backed agents are imported on first use, so importing the app stays cheap
+
+import importlib
+from agents import config  # noqa: F401  (loads .env)
+
+# Submodules that pull in openai / pydantic; resolved by __getattr__ the first time they are touched
+LAZY_MODULES = ("llm", "info_collector", "question_generator", "evaluator")
+
+
+def __getattr__(name):
+    if name in LAZY_MODULES:
+        return importlib.import_module(f"agents.{name}")
+    raise AttributeError(f"module 'agents' has no attribute {name!r}")
+
+
+def preload():
+    """Import the lazy agents now, e.g. on a background thread while the first page renders."""
+    for name in LAZY_MODULES:
+        importlib.import_module(f"agents.{name}")
@@ -0,0 +1,5 @@
+#Configuration - .env is loaded once per process, before any agent module reads its TALENTSCOUT_* settings
+
+import dotenv
+
+dotenv.load_dotenv()
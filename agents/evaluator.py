@@ -1,10 +1,8 @@
 # Answer Evaluator Agent logic
 
-from openai import OpenAI
-import os
-import dotenv
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
+from agents import llm, metrics, pregrade, question_cache
 
 class EvaluationResult(BaseModel):
     score: int                 #0 - 10
@@ -13,22 +11,40 @@ class EvaluationResult(BaseModel):
     strengths: List[str]
     weaknesses: List[str]
 
-dotenv.load_dotenv()
-
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+class AnswerScore(BaseModel):
+    score: int                 #0 - 10 for this single answer
+    strength: Optional[str]    #one short phrase, if any
+    weakness: Optional[str]    #one short phrase, if any
 
 def assessment_agent(candidate_data, questions, answers):
-
-    qa_pairs = [
-        {
-            "question": q,
-            "answer": answers.get(q, "")
-        }
-        for q in questions
-    ]
-
-    response = client.responses.parse(
-        model="gpt-4o-2024-08-06",
+    """
+    Non-answers are graded locally and left out of the LLM call, which is
+    skipped when none remain; the rest go to the model with their reference
+    answers.
+    """
+
+    local = {}
+    for q in questions:
+        score, path = pregrade.grade(answers.get(q, ""))
+        metrics.inc("answer_grading", path=path)
+        if score is not None:
+            local[q] = score
+    if len(local) == len(questions):
+        return aggregate_evaluation(list(local.values()))
+
+    references = question_cache.default_cache.references([q for q in questions if q not in local])
+    qa_pairs = []
+    for q in questions:
+        if q in local:
+            continue
+        pair = {"question": q, "answer": answers.get(q, "")}
+        if references.get(q):
+            pair["reference"] = references[q]
+            pair["hint"] = pregrade.overlap_hint(pair["answer"], references[q])
+        qa_pairs.append(pair)
+
+    response = llm.parse(
+        "evaluator",
         input=[
             {
                 "role": "system",
@@ -55,6 +71,8 @@ def assessment_agent(candidate_data, questions, answers):
                         - 9–10: Strong, confident, accurate answers
 
                          Note: If answer is 'pass', 'idk', or 'I don't know', treat as incorrect (score 0 for that question).
+                         Note: A reference answer, when given, lists the key points; accept other correct wordings.
+                         The key-term overlap hint ignores word order and negation; judge the answer yourself.
 
                         Verdict rules:
                         - PASS → score ≥ 7
@@ -78,5 +96,105 @@ def assessment_agent(candidate_data, questions, answers):
         text_format=EvaluationResult
     )
 
+    result = response.output_parsed.model_dump()
+    if local:
+        # Blend the locally graded answers into the LLM's score over the rest
+        total = result["score"] * len(qa_pairs) + sum(s["score"] for s in local.values())
+        result["score"] = round(total / len(questions))
+        result["verdict"] = verdict_for(result["score"])
+        if any(s["score"] == 0 for s in local.values()):
+            result["weaknesses"] = (result["weaknesses"] + ["Skipped some questions"])[:3]
+    return result
+
+
+
+def verdict_for(score: int) -> str:
+    if score >= 7:
+        return "PASS"
+    if score >= 4:
+        return "BORDERLINE"
+    return "FAIL"
+
+
+def answer_scoring_agent(candidate_data, question, answer, reference=None):
+    """
+    Score one Q/A pair; run in the background while the next question is shown.
+    Non-answers are graded locally; otherwise the question's reference answer
+    and its key-term overlap with the answer are given to the LLM as guidance.
+    """
+
+    score, path = pregrade.grade(answer)
+    metrics.inc("answer_grading", path=path)
+    if score is not None:
+        return score
+    if reference is None:
+        reference = question_cache.default_cache.references([question]).get(question)
+    hint = pregrade.overlap_hint(answer, reference)
+
+    response = llm.parse(
+        "evaluator",
+        input=[
+            {
+                "role": "system",
+                "content": f"""
+                        You are a technical evaluator for an initial hiring screening.
+                        Score ONE answer to ONE technical question.
+
+                        Candidate context:
+                        - Role: {candidate_data.get("desired_positions")}
+                        - Years of experience: {candidate_data.get("yoe")}
+
+                        Evaluation rules:
+                        - Judge correctness, clarity, and technical accuracy
+                        - Partial answers are acceptable
+                        - Do NOT be overly strict
+
+                        Scoring rubric (0-10):
+                        - 0–3: Mostly incorrect or vague
+                        - 4–6: Some correct understanding, but gaps
+                        - 7–8: Mostly correct, practical knowledge
+                        - 9–10: Strong, confident, accurate
+
+                        Note: A reference answer, when given, lists the key points; accept other correct wordings.
+                        The key-term overlap hint ignores word order and negation; judge the answer yourself.
+
+                        Output rules:
+                        - strength / weakness: at most one short phrase each, or null
+                        - Do not mention the rubric explicitly
+                        """
+            },
+            {
+                "role": "user",
+                "content": f"Question: {question}\n"
+                           + (f"Reference answer: {reference}\n" if reference else "")
+                           + f"Answer: {answer}"
+                           + (f"\n{hint}" if hint else "")
+            }
+        ],
+        text_format=AnswerScore
+    )
+
     return response.output_parsed.model_dump()
 
+
+def aggregate_evaluation(scores):
+    """Fold per-answer scores into the EvaluationResult shape without another LLM call."""
+
+    if not scores:
+        return EvaluationResult(
+            score=0, verdict="FAIL", summary="No answers were provided.",
+            strengths=[], weaknesses=[]
+        ).model_dump()
+
+    score = round(sum(s["score"] for s in scores) / len(scores))
+    strong = sum(1 for s in scores if s["score"] >= 7)
+    strengths = list(dict.fromkeys(s["strength"] for s in scores if s.get("strength")))
+    weaknesses = list(dict.fromkeys(s["weakness"] for s in scores if s.get("weakness")))
+
+    return EvaluationResult(
+        score=score,
+        verdict=verdict_for(score),
+        summary=f"Answered {strong} of {len(scores)} questions with solid, accurate responses.",
+        strengths=strengths[:3],
+        weaknesses=weaknesses[:3],
+    ).model_dump()
@@ -0,0 +1,158 @@
+#Fake LLM backend - offline stand-in for the responses API (see agents.llm.set_backend)
+
+import re
+import math
+import itertools
+import time
+import random
+import typing
+import asyncio
+from types import SimpleNamespace
+
+
+def _last_user_message(input) -> str:
+    if isinstance(input, str):
+        return input
+    for message in reversed(input):
+        if message.get("role") == "user":
+            return message.get("content", "")
+    return ""
+
+
+def _pairs(text: str) -> dict:
+    """Read 'field: value' pairs separated by ';' or newlines, lists split on ','."""
+    pairs = {}
+    for chunk in re.split(r"[;\n]", text):
+        key, sep, value = chunk.partition(":")
+        if sep and key.strip() and value.strip():
+            pairs[key.strip().lower()] = value.strip()
+    return pairs
+
+
+def _is_list(annotation) -> bool:
+    if typing.get_origin(annotation) is list:
+        return True
+    return any(_is_list(arg) for arg in typing.get_args(annotation))
+
+
+def fake_info(text_format, input):
+    values = {}
+    for key, value in _pairs(_last_user_message(input)).items():
+        field = text_format.model_fields.get(key)
+        if field is None:
+            continue
+        values[key] = [v.strip() for v in value.split(",")] if _is_list(field.annotation) else value
+    return text_format.model_validate(values)
+
+
+def fake_questions(text_format, input):
+    return text_format.model_validate({
+        "questions": [f"Fake technical question {i + 1}?" for i in range(5)],
+    })
+
+
+_generation = itertools.count(1)
+
+
+def fake_question_pools(text_format, input):
+    system = input[0]["content"] if not isinstance(input, str) else ""
+    match = re.search(r"\*\*Technologies:\*\*\s*(.+)", system)
+    techs = [t.strip() for t in match.group(1).split(",")] if match else ["General Programming"]
+    wanted = re.search(r"Generate exactly (\d+)", system)
+    count = int(wanted.group(1)) if wanted else 4
+    n = next(_generation)
+    return text_format.model_validate({
+        "pools": [
+            {
+                "tech": tech,
+                "questions": [f"Fake {tech} question {n}.{i + 1}?" for i in range(count)],
+                "references": [f"{tech} hash map index" for _ in range(count)],
+            }
+            for tech in techs
+        ],
+    })
+
+
+def fake_evaluation(text_format, input):
+    return text_format.model_validate({
+        "score": 6,
+        "verdict": "BORDERLINE",
+        "summary": "Offline evaluation from the fake backend.",
+        "strengths": ["Responds to every question"],
+        "weaknesses": ["Answers not checked offline"],
+    })
+
+
+def fake_answer_score(text_format, input):
+    return text_format.model_validate({"score": 6, "strength": None, "weakness": None})
+
+
+RESPONDERS = {
+    "Info": fake_info,
+    "TechQuestions": fake_questions,
+    "TechQuestionPools": fake_question_pools,
+    "EvaluationResult": fake_evaluation,
+    "AnswerScore": fake_answer_score,
+}
+
+
+class Latency:
+    """Log-normal latency fitted to a median and p99, in seconds."""
+
+    def __init__(self, median: float, p99: float | None = None):
+        self.median = median
+        # 2.326 is the z-score of the 99th percentile
+        self.sigma = math.log(p99 / median) / 2.326 if p99 and median > 0 else 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median <= 0:
+            return 0.0
+        return rng.lognormvariate(math.log(self.median), self.sigma) if self.sigma else self.median
+
+
+def _approx_tokens(value) -> int:
+    return max(1, len(str(value)) // 4)
+
+
+class FakeBackend:
+    """Returns valid structured payloads for each agent's text_format without network access."""
+
+    def __init__(self, responders: dict | None = None, latency: dict | None = None, seed: int | None = None):
+        """latency maps a text_format name (or "default") to a Latency; none means instant."""
+        self.responders = {**RESPONDERS, **(responders or {})}
+        self.latency = latency or {}
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    def delay(self, text_format) -> float:
+        latency = self.latency.get(text_format.__name__) or self.latency.get("default")
+        return latency.sample(self.rng) if latency else 0.0
+
+    def respond(self, model, input, text_format):
+        self.calls += 1
+        parsed = self.responders[text_format.__name__](text_format, input)
+        output_text = parsed.model_dump_json()
+        return SimpleNamespace(
+            model=model,
+            output_parsed=parsed,
+            output_text=output_text,
+            usage=SimpleNamespace(input_tokens=_approx_tokens(input), output_tokens=_approx_tokens(output_text)),
+        )
+
+    def parse(self, model, input, text_format, timeout):
+        time.sleep(self.delay(text_format))
+        return self.respond(model, input, text_format)
+
+    async def aparse(self, model, input, text_format, timeout):
+        await asyncio.sleep(self.delay(text_format))
+        return self.respond(model, input, text_format)
+
+    def stream_parse(self, model, input, text_format, timeout, on_text, chunk_size=8):
+        response = self.respond(model, input, text_format)
+        text = response.output_text
+        chunks = range(0, len(text), chunk_size)
+        pause = self.delay(text_format) / max(1, len(chunks))
+        for i in chunks:
+            time.sleep(pause)
+            on_text(text[i:i + chunk_size])
+        return response
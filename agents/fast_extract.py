@@ -0,0 +1,99 @@
+#Fast-path extractor - deterministic pre-extraction of email, phone, YoE and tech stack
+
+import re
+import threading
+from agents import tech_index
+
+# Technology names come from the shared alias index (agents/data/tech_aliases.json).
+# Short ambiguous names ("go", "c", "r") are not aliases there and are left to the LLM.
+TECH_VOCAB = tech_index.ALIASES
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_RE = re.compile(r"\+?\d[\d\s().-]{5,}\d")
+YOE_RE = re.compile(r"\b(\d{1,2})\s*\+?\s*(?:years?|yrs?|yoe)\b", re.IGNORECASE)
+# "2019-2023", "2021 2022": digit runs that are all years are only a phone if the message says so
+YEAR_RE = re.compile(r"(?:19|20)\d\d")
+PHONE_LABEL_RE = re.compile(r"\b(?:phone|mobile|cell|tel|contact|number|whatsapp)\b", re.IGNORECASE)
+
+# Words that carry no field value on their own; anything else left over means the LLM is needed.
+FILLER_WORDS = {
+    "a", "an", "and", "or", "the", "my", "is", "am", "i", "i'm", "im", "have", "has", "of", "in",
+    "with", "on", "at", "to", "me", "it", "its", "also", "about", "around", "over", "plus",
+    "email", "e-mail", "mail", "phone", "number", "mobile", "contact", "cell", "tel", "no",
+    "years", "year", "yrs", "yr", "yoe", "experience", "exp", "experienced", "total",
+    "tech", "stack", "skills", "skill", "know", "use", "using", "work", "worked", "working",
+    "hi", "hello", "hey", "here", "sure", "ok", "okay", "yes", "thanks", "thank", "you", "it's",
+}
+
+
+def _alias_pattern() -> tuple[re.Pattern, dict]:
+    lookup = {}
+    for canonical, aliases in TECH_VOCAB.items():
+        for alias in aliases:
+            lookup[alias] = canonical
+    alternation = "|".join(re.escape(a) for a in sorted(lookup, key=len, reverse=True))
+    pattern = re.compile(rf"(?<![\w.+#-])(?:{alternation})(?![\w+#-]|\.\w)", re.IGNORECASE)
+    return pattern, lookup
+
+
+TECH_RE, TECH_LOOKUP = _alias_pattern()
+
+# path -> {"turns": count, "seconds": total agent latency}
+PATH_STATS = {}
+_stats_lock = threading.Lock()
+
+
+def record_path(path: str, seconds: float):
+    with _stats_lock:
+        entry = PATH_STATS.setdefault(path, {"turns": 0, "seconds": 0.0})
+        entry["turns"] += 1
+        entry["seconds"] += seconds
+
+
+def path_stats() -> dict:
+    with _stats_lock:
+        return {path: dict(entry) for path, entry in PATH_STATS.items()}
+
+
+def fast_extract(user_input: str) -> tuple[dict, bool]:
+    """
+    Extract the fields that can be matched deterministically.
+    Returns (fields, resolved) where resolved is True when nothing in the
+    message is left unexplained, i.e. an LLM call would add no information.
+    """
+    fields = {}
+    remainder = user_input
+
+    emails = EMAIL_RE.findall(remainder)
+    if emails:
+        fields["email"] = emails[0]
+        remainder = EMAIL_RE.sub(" ", remainder)
+
+    # YoE before phone so "4567 4 years" does not fold the 4 into the phone number
+    yoe = YOE_RE.search(remainder)
+    if yoe:
+        fields["yoe"] = int(yoe.group(1))
+        remainder = YOE_RE.sub(" ", remainder)
+
+    labelled = PHONE_LABEL_RE.search(user_input) is not None
+    for match in PHONE_RE.finditer(remainder):
+        digits = re.sub(r"\D", "", match.group())
+        if not labelled and all(YEAR_RE.fullmatch(run) for run in re.findall(r"\d+", match.group())):
+            continue    # left in the remainder, so the LLM reads it
+        if 7 <= len(digits) <= 15:
+            fields["phone"] = int(digits)
+            remainder = remainder.replace(match.group(), " ", 1)
+            break
+
+    techs = []
+    for match in TECH_RE.finditer(remainder):
+        canonical = TECH_LOOKUP[match.group().lower()]
+        if canonical not in techs:
+            techs.append(canonical)
+    if techs:
+        fields["tech_stack"] = techs
+        remainder = TECH_RE.sub(" ", remainder)
+
+    # Any number still here (an age, a year, a salary) is unexplained, so the LLM reads the message
+    leftover = [w for w in re.findall(r"[\w'-]+", remainder.lower()) if w not in FILLER_WORDS]
+    return fields, bool(fields) and not leftover
@@ -1,12 +1,8 @@
 #Greeting + Information Collector Agent logic
 from pydantic import BaseModel
-from openai import OpenAI
-import os
-import dotenv
-import streamlit as st
+import time
 from typing import Optional
-
-dotenv.load_dotenv()
+from agents import fast_extract, llm, metrics
 
 class Info(BaseModel):
     name: Optional[str] = None
@@ -17,54 +13,90 @@ class Info(BaseModel):
     loc: Optional[str] = None
     tech_stack: Optional[list[str]] = None
 
-OPENAI_API_KEY=os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=OPENAI_API_KEY)
+# Fast-path fields trusted even when the LLM had to read the message
+HYBRID_FIELDS = ("email",)
 
 def info_collection_agent(user_input:str, candidate_data):
-    response = client.responses.parse(
-        model="gpt-4o-2024-08-06",
-        input=[
-            {
-                "role": "system", 
-                "content": f"""
-                    You are an information extraction agent in a hiring screening system.
-
-                    Current candidate data (already collected):
-                    {candidate_data}
-
-                    Your task:
-                    - Read the user's message
-                    - Extract ONLY the information that is explicitly provided
-                    - Return ONLY newly extracted fields (omit fields not mentioned)
-                    - Do NOT guess or infer missing information
-                    - Do NOT ask questions or provide explanations
-                    
-                    Off-topic handling:
-                    - If user asks questions unrelated to the screening, politely redirect them
-                    - Say: "I'm here to help with the TalentScout screening process. Please focus on providing the requested information. For other inquiries, please contact our HR team."
-                    - Always stay focused on gathering the required fields
-
-                    Fields to extract:
-                    - name (string)
-                    - email (string)
-                    - phone (integer, digits only)
-                    - yoe (years of experience, integer)
-                    - desired_positions (list of strings)
-                    - loc (current location)
-                    - tech_stack (list of technologies)
-
-                    Output rules:
-                    - Return ONLY a valid JSON object with extracted fields
-                    - Include only fields present in the user's message
-                    - No explanations, comments, or extra text
-                    """
-            },
-            {
-                "role": "user",
-                "content": user_input,
-            },
-        ],
-        text_format=Info,
+    fields, _ = extract_info(user_input, candidate_data)
+    return fields
+
+def extract_info(user_input:str, candidate_data):
+    """
+    Extract candidate fields from one message, skipping the LLM when the
+    local fast path fully explains the message.
+    Returns (fields, path) with path one of "fast", "llm" or "hybrid".
+    """
+    start = time.perf_counter()
+    fields, resolved = fast_extract.fast_extract(user_input)
+
+    if resolved:
+        path = "fast"
+    else:
+        llm_fields = llm_extract(user_input, candidate_data)
+        path = "hybrid" if fields else "llm"
+        # The LLM is authoritative for the message. Outside a fully explained message the
+        # regex phone / YoE / tech guesses are ambiguous ("2019-2023", "5 years ago I used
+        # java"), so only fields that cannot be misread fill the gaps it left.
+        for key in HYBRID_FIELDS:
+            if key in fields:
+                llm_fields.setdefault(key, fields[key])
+        fields = llm_fields
+
+    fast_extract.record_path(path, time.perf_counter() - start)
+    metrics.inc("extraction_path", path=path)
+    return fields, path
+
+# Static instructions first so provider-side prompt caching can reuse the prefix across
+# turns and candidates; only the short "still missing" suffix varies per turn.
+SYSTEM_PROMPT = """You are an information extraction agent in a hiring screening system.
+
+Your task:
+- Read the user's message
+- Extract ONLY the information that is explicitly provided
+- Return ONLY newly extracted or corrected fields (omit fields not mentioned)
+- Do NOT guess or infer missing information
+- Do NOT ask questions or provide explanations
+
+Off-topic handling:
+- If user asks questions unrelated to the screening, politely redirect them
+- Say: "I'm here to help with the TalentScout screening process. Please focus on providing the requested information. For other inquiries, please contact our HR team."
+- Always stay focused on gathering the required fields
+
+Field meanings:
+- name (string)
+- email (string)
+- phone (integer, digits only)
+- yoe (years of experience, integer)
+- desired_positions (list of strings)
+- loc (current location)
+- tech_stack (list of technologies)
+
+Output rules:
+- Return ONLY a valid JSON object with extracted fields
+- Focus on the fields listed as still missing, but also return any field the user explicitly corrects (e.g. "actually my phone is ...")
+- Include only fields present in the user's message
+- No explanations, comments, or extra text"""
+
+def missing_info_fields(candidate_data) -> tuple:
+    return tuple(f for f in Info.model_fields if candidate_data.get(f) in (None, [], ""))
+
+def build_prompt(user_input:str, candidate_data):
+    # The full Info schema is sent every turn: it stays identical (cacheable) and lets a
+    # candidate correct a field collected earlier; only the "still missing" hint varies
+    fields = missing_info_fields(candidate_data) or tuple(Info.model_fields)
+    prompt = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "system", "content": f"Still missing: {', '.join(fields)}"},
+        {"role": "user", "content": user_input},
+    ]
+    return prompt, Info
+
+def llm_extract(user_input:str, candidate_data):
+    prompt, schema = build_prompt(user_input, candidate_data)
+    response = llm.parse(
+        "info_collector",
+        input=prompt,
+        text_format=schema,
     )
 
     event = response.output_parsed
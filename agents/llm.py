@@ -0,0 +1,245 @@
+#Shared LLM client layer - pooled sync/async OpenAI clients and per-agent model config
+
+import os
+import time
+import weakref
+import asyncio
+import httpx
+from functools import lru_cache
+import openai
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+from agents import metrics, resilience, router, scheduler
+
+DEFAULT_TIMEOUT = 60.0
+
+# Failures that move a call on to the next model tier
+FALLBACK_ERRORS = (openai.APIError, resilience.CircuitOpenError, resilience.DeadlineExceeded)
+
+# One pool per process, shared by every session and agent
+POOL_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("TALENTSCOUT_HTTP_MAX_CONNECTIONS", 100)),
+    max_keepalive_connections=int(os.getenv("TALENTSCOUT_HTTP_KEEPALIVE", 20)),
+    keepalive_expiry=30.0,
+)
+
+
+@lru_cache(maxsize=None)
+def agent_config(agent: str) -> dict:
+    """
+    Model tiers, timeout and latency budget for an agent, e.g.
+    TALENTSCOUT_EVALUATOR_MODELS=gpt-4o,gpt-4o-mini, TALENTSCOUT_EVALUATOR_TIMEOUT=30,
+    TALENTSCOUT_INFO_COLLECTOR_BUDGET=3 (seconds), TALENTSCOUT_EVALUATOR_HEDGE=1.
+    Timeout (the deadline for all attempts on one model) and hedging fall back
+    to TALENTSCOUT_TIMEOUT / TALENTSCOUT_HEDGE, then the defaults.
+    """
+    prefix = f"TALENTSCOUT_{agent.upper()}_"
+    budget = os.getenv(prefix + "BUDGET")
+    return {
+        "models": router.tiers_for(agent),
+        "timeout": float(os.getenv(prefix + "TIMEOUT") or os.getenv("TALENTSCOUT_TIMEOUT") or DEFAULT_TIMEOUT),
+        "budget": float(budget) if budget else None,
+        "hedge": (os.getenv(prefix + "HEDGE") or os.getenv("TALENTSCOUT_HEDGE") or "0") == "1",
+    }
+
+
+@lru_cache(maxsize=None)
+def get_client() -> OpenAI:
+    return OpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=DefaultHttpxClient(limits=POOL_LIMITS),
+    )
+
+
+# httpx async pools are bound to the event loop they were created on
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> AsyncOpenAI:
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=DefaultAsyncHttpxClient(limits=POOL_LIMITS),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+class OpenAIBackend:
+    """Default backend: the OpenAI responses API through the pooled clients."""
+
+    def parse(self, model, input, text_format, timeout):
+        return get_client().responses.parse(
+            model=model, input=input, text_format=text_format, timeout=timeout
+        )
+
+    async def aparse(self, model, input, text_format, timeout):
+        return await get_async_client().responses.parse(
+            model=model, input=input, text_format=text_format, timeout=timeout
+        )
+
+    def stream_parse(self, model, input, text_format, timeout, on_text):
+        with get_client().responses.stream(
+            model=model, input=input, text_format=text_format, timeout=timeout
+        ) as stream:
+            for event in stream:
+                if event.type == "response.output_text.delta":
+                    on_text(event.delta)
+            return stream.get_final_response()
+
+
+_backend = OpenAIBackend()
+
+
+def set_backend(backend):
+    """Swap the backend (e.g. agents.fake_llm.FakeBackend for offline runs)."""
+    global _backend
+    _backend = backend
+
+
+def get_backend():
+    return _backend
+
+
+def _first_token_wrapper(agent, model, start, on_text):
+    """on_text that also records the time to the first streamed delta."""
+    first = []
+
+    def forward(delta):
+        if not first:
+            first.append(True)
+            metrics.observe("llm_first_token_seconds", time.perf_counter() - start, agent=agent, model=model)
+        on_text(delta)
+
+    return forward
+
+
+def _call(agent, model, input, text_format, timeout, on_text=None, hedge=False, can_retry=None):
+    """One model, with retries / hedging within the deadline, instrumented."""
+    start = time.perf_counter()
+    forward = on_text and _first_token_wrapper(agent, model, start, on_text)
+    estimate = scheduler.estimate_tokens(input)
+
+    def attempt(timeout):
+        # Every attempt (retries and hedges included) spends quota, so each waits its turn,
+        # but only within its deadline; a DeadlineExceeded here moves on to the next tier
+        timeout -= scheduler.default_scheduler.acquire(agent, estimate, timeout=timeout)
+        if forward is None:
+            return _backend.parse(model, input, text_format, timeout)
+        return _backend.stream_parse(model, input, text_format, timeout, forward)
+
+    metrics.inc("llm_calls", agent=agent, model=model)
+    with metrics.span("llm_call", agent=agent, model=model):
+        # Streams are never hedged: two streams would interleave their text
+        response = resilience.call(
+            agent, model, attempt, timeout, hedge=hedge and forward is None, can_retry=can_retry
+        )
+    router.default_router.observe(model, time.perf_counter() - start)
+    _settle(agent, model, estimate, response)
+    return response
+
+
+async def _acall(agent, model, input, text_format, timeout, hedge=False):
+    start = time.perf_counter()
+    estimate = scheduler.estimate_tokens(input)
+
+    async def attempt(timeout):
+        timeout -= await scheduler.default_scheduler.aacquire(agent, estimate, timeout=timeout)
+        return await _backend.aparse(model, input, text_format, timeout)
+
+    metrics.inc("llm_calls", agent=agent, model=model)
+    with metrics.span("llm_call", agent=agent, model=model):
+        response = await resilience.acall(agent, model, attempt, timeout, hedge=hedge)
+    router.default_router.observe(model, time.perf_counter() - start)
+    _settle(agent, model, estimate, response)
+    return response
+
+
+def _settle(agent, model, estimate, response):
+    metrics.record_usage(agent, model, response)
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        actual = (getattr(usage, "input_tokens", 0) or 0) + (getattr(usage, "output_tokens", 0) or 0)
+        scheduler.default_scheduler.settle(estimate, actual)
+
+
+def _route(agent, input, budget, max_cost):
+    """(config, ordered model tiers, per-tier timeout, last-tier timeout) for one request."""
+    config = agent_config(agent)
+    budget = budget if budget is not None else config["budget"]
+    plan = router.default_router.plan(
+        config["models"], budget=budget, max_cost=max_cost, input_tokens=len(str(input)) // 4
+    )
+    # Within a latency budget a slow tier is abandoned in favour of the next one
+    timeout = min(config["timeout"], budget) if budget else config["timeout"]
+    return config, plan, timeout, config["timeout"]
+
+
+def _served(agent, model, tier):
+    metrics.inc("llm_route", agent=agent, model=model, tier=str(tier), outcome="served")
+
+
+def _failed(agent, model, tier, error):
+    metrics.inc("llm_route", agent=agent, model=model, tier=str(tier), outcome=type(error).__name__)
+
+
+def parse(agent: str, input, text_format, on_text=None, budget=None, max_cost=None):
+    """
+    Structured call for an agent, routed over its model tiers. Transient errors
+    are retried on the same model; the call falls back to the next tier when a
+    tier keeps failing, its breaker is open, or it overruns the latency budget (seconds);
+    max_cost caps the estimated USD per call. With on_text, the output is
+    streamed and on_text(delta) receives raw output text as it arrives; the
+    returned response still carries the fully validated output_parsed.
+    """
+    config, plan, timeout, last_timeout = _route(agent, input, budget, max_cost)
+    streamed = []
+    if on_text is not None:
+        forward = on_text
+
+        def on_text(delta):
+            streamed.append(True)
+            forward(delta)
+
+    for tier, model in enumerate(plan):
+        final = tier == len(plan) - 1
+        try:
+            response = _call(
+                agent, model, input, text_format, last_timeout if final else timeout, on_text,
+                hedge=config["hedge"], can_retry=lambda: not streamed,
+            )
+        except FALLBACK_ERRORS as e:
+            _failed(agent, model, tier, e)
+            # Text already shown to the user cannot be replaced by another model's output
+            if final or streamed:
+                raise
+            continue
+        _served(agent, model, tier)
+        return response
+
+
+async def aparse(agent: str, input, text_format, budget=None, max_cost=None):
+    """
+    parse() for callers running their own event loop, on the per-loop
+    AsyncOpenAI client; same routing, deadlines, retries and quota. No streaming.
+    """
+    config, plan, timeout, last_timeout = _route(agent, input, budget, max_cost)
+    for tier, model in enumerate(plan):
+        final = tier == len(plan) - 1
+        try:
+            response = await _acall(
+                agent, model, input, text_format, last_timeout if final else timeout, hedge=config["hedge"]
+            )
+        except FALLBACK_ERRORS as e:
+            _failed(agent, model, tier, e)
+            if final:
+                raise
+            continue
+        _served(agent, model, tier)
+        return response
+
+
+if os.getenv("TALENTSCOUT_LLM_BACKEND") == "fake":
+    from agents.fake_llm import FakeBackend
+    set_backend(FakeBackend())
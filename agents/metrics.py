@@ -0,0 +1,145 @@
+#Instrumentation - timing spans, token usage and hit counters with Prometheus / JSONL export
+
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Raw samples kept per series for in-process percentiles (the exported histograms are
+# cumulative and never drop observations), and observations pending a JSONL flush
+MAX_SAMPLES = 10000
+MAX_EVENTS = 100000
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return (name, tuple(sorted(labels.items())))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """Cumulative per-bucket counts, count and sum of one series, as Prometheus expects."""
+
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+        self.count += 1
+        self.sum += value
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.samples = defaultdict(list)
+        self.histograms = defaultdict(Histogram)
+        self.gauges = {}
+        self._events = deque(maxlen=MAX_EVENTS)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        with self._lock:
+            self.counters[_key(name, labels)] += value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        with self._lock:
+            self.gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, seconds: float, **labels):
+        with self._lock:
+            key = _key(name, labels)
+            self.histograms[key].observe(seconds)
+            series = self.samples[key]
+            series.append(seconds)
+            if len(series) > MAX_SAMPLES:
+                del series[: len(series) - MAX_SAMPLES]
+            self._events.append({"ts": time.time(), "metric": name, "seconds": round(seconds, 6), **labels})
+
+    @contextmanager
+    def span(self, name: str, **labels):
+        """Time a block into the `<name>_seconds` histogram."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(f"{name}_seconds", time.perf_counter() - start, **labels)
+
+    def percentile(self, name: str, q: float, **labels):
+        with self._lock:
+            series = sorted(self.samples.get(_key(name, labels), ()))
+        if not series:
+            return None
+        return series[min(len(series) - 1, int(q * len(series)))]
+
+    def count(self, name: str, **labels) -> int:
+        """Observations recorded for a series since start-up (or the last reset)."""
+        with self._lock:
+            histogram = self.histograms.get(_key(name, labels))
+            return histogram.count if histogram else 0
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.samples.clear()
+            self.histograms.clear()
+            self.gauges.clear()
+            self._events.clear()
+
+    def to_prometheus(self) -> str:
+        def fmt(labels):
+            return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}" if labels else ""
+
+        lines = []
+        with self._lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                lines.append(f"talentscout_{name}_total{fmt(labels)} {value:g}")
+            for (name, labels), value in sorted(self.gauges.items()):
+                lines.append(f"talentscout_{name}{fmt(labels)} {value:g}")
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                for bound, count in zip(BUCKETS, histogram.buckets):
+                    lines.append(f"talentscout_{name}_bucket{fmt(labels + (('le', bound),))} {count}")
+                lines.append(f"talentscout_{name}_bucket{fmt(labels + (('le', '+Inf'),))} {histogram.count}")
+                lines.append(f"talentscout_{name}_sum{fmt(labels)} {histogram.sum:.6f}")
+                lines.append(f"talentscout_{name}_count{fmt(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        with open(path, "w") as f:
+            f.write(self.to_prometheus())
+
+    def flush_jsonl(self, path: str):
+        """Append the observations recorded since the last flush, one JSON object per line."""
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+        with open(path, "a") as f:
+            for event in events:
+                f.write(json.dumps(event) + "\n")
+
+
+registry = Registry()
+inc = registry.inc
+observe = registry.observe
+span = registry.span
+
+
+def record_usage(agent: str, model: str, response):
+    """Token counts from the responses API usage block, if present."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    registry.inc("llm_input_tokens", getattr(usage, "input_tokens", 0) or 0, agent=agent, model=model)
+    registry.inc("llm_output_tokens", getattr(usage, "output_tokens", 0) or 0, agent=agent, model=model)
@@ -0,0 +1,61 @@
+#Local answer pre-grading - deterministic scores for non-answers and a key-term overlap hint for the LLM
+
+import re
+
+# Normalized answers that mean "no answer"; the evaluator prompt already scores these 0
+TRIVIAL_ANSWERS = {
+    "", "pass", "skip", "idk", "dunno", "no idea", "no clue", "not sure", "na", "n a",
+    "i dont know", "i do not know", "dont know", "do not know", "i dont remember",
+}
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "but", "of", "to", "in", "on", "for", "with", "by", "at", "from",
+    "as", "is", "are", "was", "were", "be", "been", "it", "its", "this", "that", "these", "those",
+    "you", "we", "i", "use", "used", "using", "can", "will", "would", "should", "which", "when",
+    "what", "how", "do", "does", "if", "so", "then", "than", "into", "via", "also",
+}
+
+TOKEN_RE = re.compile(r"[a-z0-9_#+]+")
+
+# References this short give a meaningless overlap figure
+MIN_REFERENCE_TERMS = 2
+
+
+def normalize(answer: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9 ]", " ", str(answer or "").lower().replace("'", "")).split())
+
+
+def terms(text: str) -> set:
+    # Single characters are mostly placeholders ("x", "e.g.") rather than key terms
+    return {t for t in TOKEN_RE.findall(str(text or "").lower().replace("`", "")) if len(t) > 1 and t not in STOPWORDS}
+
+
+def similarity(answer: str, reference: str) -> float:
+    """Fraction of the reference's key terms that appear in the answer."""
+    wanted = terms(reference)
+    return len(wanted & terms(answer)) / len(wanted) if wanted else 0.0
+
+
+def trivial_score(answer: str):
+    if normalize(answer) in TRIVIAL_ANSWERS:
+        return {"score": 0, "strength": None, "weakness": "No answer given"}
+    return None
+
+
+def overlap_hint(answer: str, reference: str | None):
+    """
+    "Key-term overlap with the reference: 80%" for the LLM prompt, or None.
+    Only a hint: bag-of-words overlap ignores word order and negation, so a
+    wrong answer ("UNION ALL removes duplicates") can match as well as a right one.
+    """
+    if not reference or len(terms(reference)) < MIN_REFERENCE_TERMS:
+        return None
+    return f"Key-term overlap with the reference: {similarity(answer, reference):.0%}"
+
+
+def grade(answer: str):
+    """(AnswerScore dict, "trivial") for a non-answer, else (None, "llm")."""
+    score = trivial_score(answer)
+    if score is not None:
+        return score, "trivial"
+    return None, "llm"
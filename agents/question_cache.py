@@ -0,0 +1,168 @@
+#Question Bank Cache - two tier (in-process LRU + shared SQLite) store of per-technology question pools
+
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from agents import tech_index
+
+CACHE_PATH = os.getenv("TALENTSCOUT_QUESTION_CACHE", ".cache/question_bank.sqlite3")
+CACHE_TTL = int(os.getenv("TALENTSCOUT_QUESTION_CACHE_TTL", 7 * 24 * 3600))
+LRU_SIZE = int(os.getenv("TALENTSCOUT_QUESTION_CACHE_LRU", 256))
+
+# Questions are pooled per (technology, YoE band). A pool below POOL_TARGET counts as
+# depleted and is topped up by generation; otherwise candidates are served from it.
+POOL_TARGET = int(os.getenv("TALENTSCOUT_QUESTION_POOL_TARGET", 6))
+BANK_MAX = 40
+
+
+def yoe_band(yoe) -> str:
+    try:
+        years = int(yoe)
+    except (TypeError, ValueError):
+        years = 0
+    if years <= 2:
+        return "0-2"
+    if years <= 5:
+        return "3-5"
+    return "5+"
+
+
+def signature(candidate_data: dict) -> str:
+    """Key for the inputs question generation depends on (canonical stack, YoE band)."""
+    stack = ",".join(sorted(t.lower() for t in tech_index.canonicalize_stack(candidate_data.get("tech_stack"))))
+    return f"{stack}|{yoe_band(candidate_data.get('yoe'))}"
+
+
+def pool_key(tech: str, band: str) -> str:
+    return f"pool:{tech.lower()}|{band}"
+
+
+def compose(pools: dict, first: str | None = None, low: int = 3, high: int = 5) -> list[str]:
+    """
+    Draw 3-5 questions round-robin across the technologies' pools, so every
+    declared technology is covered before any is asked twice.
+    """
+    draws = {tech: random.sample(qs, len(qs)) for tech, qs in pools.items() if qs}
+    total = min(sum(len(qs) for qs in draws.values()), random.randint(low, high))
+    questions = [first] if first else []
+    techs = list(draws)
+    random.shuffle(techs)
+    while len(questions) < total and any(draws.values()):
+        for tech in techs:
+            while draws[tech] and draws[tech][-1] in questions:
+                draws[tech].pop()
+            if draws[tech] and len(questions) < total:
+                questions.append(draws[tech].pop())
+    return questions
+
+
+class QuestionCache:
+    def __init__(self, path: str = CACHE_PATH, ttl: int = CACHE_TTL, max_entries: int = LRU_SIZE):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._memory = OrderedDict()    # key -> (expires_at, questions)
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS question_bank ("
+                "key TEXT PRIMARY KEY, questions TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS reference_answers ("
+                "question TEXT PRIMARY KEY, reference TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, key: str, expires_at: float, questions: list[str]):
+        self._memory[key] = (expires_at, questions)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, questions = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    return list(questions)
+                del self._memory[key]
+
+            row = self._db().execute(
+                "SELECT questions, updated_at FROM question_bank WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] + self.ttl <= now:
+                return None
+            questions = json.loads(row[0])
+            self._remember(key, row[1] + self.ttl, questions)
+            return list(questions)
+
+    def put(self, key: str, questions: list[str]) -> list[str]:
+        """Merge questions into the bank for key and return the updated bank."""
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            # Read-merge-write in one write transaction, against the database rather than the
+            # LRU copy, so questions other processes added since are kept
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(
+                    "SELECT questions, updated_at FROM question_bank WHERE key = ?", (key,)
+                ).fetchone()
+                bank = json.loads(row[0]) if row is not None and row[1] + self.ttl > now else []
+                for q in questions:
+                    if q not in bank:
+                        bank.append(q)
+                bank = bank[-BANK_MAX:]
+                db.execute(
+                    "INSERT OR REPLACE INTO question_bank (key, questions, updated_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(bank), now),
+                )
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            self._remember(key, now + self.ttl, bank)
+        return list(bank)
+
+    def put_references(self, references: dict):
+        """Store short reference answers, keyed by question text."""
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            with db:
+                db.executemany(
+                    "INSERT OR REPLACE INTO reference_answers (question, reference, updated_at) VALUES (?, ?, ?)",
+                    [(q, ref, now) for q, ref in references.items() if ref],
+                )
+
+    def references(self, questions: list) -> dict:
+        """question -> reference answer, for the questions that have one."""
+        if not questions:
+            return {}
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT question, reference FROM reference_answers WHERE question IN "
+                f"({','.join('?' * len(questions))})",
+                list(questions),
+            ).fetchall()
+        return dict(rows)
+
+
+default_cache = QuestionCache()
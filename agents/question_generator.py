@@ -1,31 +1,60 @@
 #Question Generator Agent logic
 
-from openai import OpenAI
 from pydantic import BaseModel
-import os
-import dotenv
-import streamlit as st
+from agents import question_cache, llm, metrics, tech_index
+from agents.streaming import field_callback
 
+class TechQuestions(BaseModel):
+    questions: list[str]
 
-dotenv.load_dotenv()
+class TechPool(BaseModel):
+    tech: str
+    questions: list[str]
+    references: list[str] = []      # short reference answer per question, same order
 
+class TechQuestionPools(BaseModel):
+    pools: list[TechPool]
 
-OPENAI_API_KEY=os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=OPENAI_API_KEY)
+# Questions generated per technology whenever its pool is topped up; one fill of an
+# empty pool reaches POOL_TARGET, so a new technology costs a single LLM call
+QUESTIONS_PER_TECH = question_cache.POOL_TARGET
 
-class TechQuestions(BaseModel):
-    questions: list[str]
 
+def question_generation_agent(candidate_data, on_first_question=None):
+    """
+    Returns {"questions": [...]} composed from per-technology, per-YoE-band pools.
+    Only pools that are empty or depleted are filled by the LLM. With
+    on_first_question, that generation is streamed and the first question's
+    text is passed on as it arrives.
+    """
+    techs = tech_index.canonicalize_stack(candidate_data.get("tech_stack")) or ["General Programming"]
+    band = question_cache.yoe_band(candidate_data.get("yoe"))
+
+    pools = {t: question_cache.default_cache.get(question_cache.pool_key(t, band)) or [] for t in techs}
+    depleted = [t for t in techs if len(pools[t]) < question_cache.POOL_TARGET]
+    metrics.inc("question_pool", len(techs) - len(depleted), result="hit")
+
+    first = None
+    if depleted:
+        metrics.inc("question_pool", len(depleted), result="fill")
+        generated = generate_pools(depleted, band, on_first_question)
+        for tech, questions in generated.items():
+            pools[tech] = question_cache.default_cache.put(question_cache.pool_key(tech, band), questions)
+            first = first or (questions[0] if questions else None)
+
+    # A streamed first question must stay first so the candidate sees what they were shown
+    return TechQuestions(
+        questions=question_cache.compose(pools, first=first if on_first_question else None)
+    ).model_dump()
 
-def question_generation_agent(candidate_data):
 
-    tech_stack = ", ".join(candidate_data.get("tech_stack", []))
-    yoe = candidate_data.get("yoe", "0")
-    position = ", ".join(candidate_data.get("desired_positions", []))
+def generate_pools(techs, band, on_first_question=None):
+    """One LLM call that generates QUESTIONS_PER_TECH questions for each technology."""
 
+    tech_stack = ", ".join(techs)
 
-    response = client.responses.parse(
-        model="gpt-4o-2024-08-06",
+    response = llm.parse(
+        "question_generator",
         input=[
                 {
                     "role": "system", 
@@ -35,13 +64,14 @@ def question_generation_agent(candidate_data):
                         Your objective is to generate a "Sniff Test" — a rapid, low-friction technical screening to verify if a candidate is telling the truth about their skills.
                         
                         ### CANDIDATE CONTEXT
-                        - **Target Role:** {position}
-                        - **Years of Experience (YoE):** {yoe}
-                        - **Declared Tech Stack:** {tech_stack}
+                        - **Years of Experience (YoE):** {band}
+                        - **Technologies:** {tech_stack}
 
                         ### CORE INSTRUCTION
-                        Generate exactly 3 to 5 technical questions based *strictly* on the declared Tech Stack. 
+                        Generate exactly {QUESTIONS_PER_TECH} technical questions for EACH listed technology, based *strictly* on that technology.
+                        Return one pool per technology, using the technology name exactly as listed.
                         The questions must be answerable in **1 or 2 short sentences**.
+                        For every question, also give a reference answer of at most 15 words (the key terms a correct answer must contain) in `references`, in the same order as the questions.
 
                         ### 1. ADAPTIVE DIFFICULTY MATRIX (CRITICAL)
                         You must calibrate the complexity of your questions based on the candidate's YoE:
@@ -93,11 +123,23 @@ def question_generation_agent(candidate_data):
                 },
                 
             ],
-            text_format=TechQuestions,
+            text_format=TechQuestionPools,
+            on_text=field_callback("questions", on_first_question, first_item=True),
     )
 
-    event = response.output_parsed
-    return event.model_dump()
+    # Keep only pools for requested technologies, matched by canonical name
+    wanted = {t.lower(): t for t in techs}
+    generated = {}
+    references = {}
+    for pool in response.output_parsed.pools:
+        tech = wanted.get(tech_index.canonicalize(pool.tech).lower())
+        if tech and pool.questions:
+            generated.setdefault(tech, []).extend(pool.questions)
+            # Misaligned references are worse than none: they would mis-grade answers
+            if len(pool.references) == len(pool.questions):
+                references.update(zip(pool.questions, pool.references))
+    question_cache.default_cache.put_references(references)
+    return generated
 
 
 # print(question_generation_agent())
@@ -0,0 +1,228 @@
+#Resilience - per-call deadlines, jittered retries, per-model circuit breakers and hedged requests
+
+import asyncio
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import openai
+from agents import metrics
+
+# Errors worth another attempt; anything else (bad request, auth, validation) fails at once
+RETRYABLE = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+MAX_ATTEMPTS = int(os.getenv("TALENTSCOUT_LLM_ATTEMPTS", 3))
+BACKOFF_BASE = 0.5      # seconds; attempt n sleeps uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**n))
+BACKOFF_MAX = 8.0
+
+# Consecutive retryable failures that open a model's breaker, and how long it stays open
+BREAKER_THRESHOLD = int(os.getenv("TALENTSCOUT_BREAKER_THRESHOLD", 5))
+BREAKER_COOLDOWN = float(os.getenv("TALENTSCOUT_BREAKER_COOLDOWN", 30))
+
+# A hedge fires once the first attempt outlives this quantile of recent attempts
+HEDGE_QUANTILE = 0.95
+HEDGE_MIN_SAMPLES = 20
+
+# Hedged sync calls run their attempts here; the caller's thread just waits on them
+hedge_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="talentscout-hedge")
+
+
+class CircuitOpenError(Exception):
+    """The model's breaker is open; the call was not attempted."""
+
+
+class DeadlineExceeded(Exception):
+    """The call's deadline passed before an attempt could succeed."""
+
+
+class CircuitBreaker:
+    """
+    closed -> open after BREAKER_THRESHOLD consecutive failures; after the
+    cooldown one trial call is let through (half-open) and its outcome
+    closes or re-opens the breaker.
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._trial or time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self._trial = True
+            return True
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def release(self):
+        """End a trial without a verdict; the breaker stays open and the next call is the trial."""
+        with self._lock:
+            self._trial = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker(model: str) -> CircuitBreaker:
+    with _breakers_lock:
+        if model not in _breakers:
+            _breakers[model] = CircuitBreaker()
+        return _breakers[model]
+
+
+def backoff(attempt: int) -> float:
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def hedge_delay(agent: str, model: str):
+    """Seconds after which to hedge, or None while there is too little history."""
+    if metrics.registry.count("llm_attempt_seconds", agent=agent, model=model) < HEDGE_MIN_SAMPLES:
+        return None
+    return metrics.registry.percentile("llm_attempt_seconds", HEDGE_QUANTILE, agent=agent, model=model)
+
+
+def _timed(agent, model, attempt, timeout):
+    start = time.perf_counter()
+    result = attempt(timeout)
+    metrics.observe("llm_attempt_seconds", time.perf_counter() - start, agent=agent, model=model)
+    return result
+
+
+def _hedged(agent, model, attempt, timeout, delay):
+    first = hedge_executor.submit(_timed, agent, model, attempt, timeout)
+    done, _ = wait([first], timeout=delay)
+    if done:
+        return first.result()
+    metrics.inc("llm_hedges", agent=agent, model=model)
+    pending = {first, hedge_executor.submit(_timed, agent, model, attempt, max(0.0, timeout - delay))}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                # The other attempt cannot be interrupted; it finishes in the background
+                return future.result()
+            error = error or future.exception()
+    raise error
+
+
+async def _ahedged(agent, model, attempt, timeout, delay):
+    first = asyncio.ensure_future(_atimed(agent, model, attempt, timeout))
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done:
+        return first.result()
+    metrics.inc("llm_hedges", agent=agent, model=model)
+    pending = {first, asyncio.ensure_future(_atimed(agent, model, attempt, max(0.0, timeout - delay)))}
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = error or task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _atimed(agent, model, attempt, timeout):
+    start = time.perf_counter()
+    result = await attempt(timeout)
+    metrics.observe("llm_attempt_seconds", time.perf_counter() - start, agent=agent, model=model)
+    return result
+
+
+def _check(model, deadline):
+    # Deadline first: allow() may hand out the half-open trial, which must then be attempted
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceeded(model)
+    if not breaker(model).allow():
+        raise CircuitOpenError(model)
+    return remaining
+
+
+def call(agent: str, model: str, attempt, deadline: float, hedge: bool = False, can_retry=None):
+    """
+    Run attempt(timeout) until it succeeds, fails permanently, or the deadline
+    (seconds from now) passes. Retryable errors back off with full jitter and
+    count against the model's breaker. can_retry() vetoes further attempts
+    (e.g. once streamed text has reached the user).
+    """
+    deadline = time.monotonic() + deadline
+    for n in range(MAX_ATTEMPTS):
+        remaining = _check(model, deadline)
+        delay = hedge_delay(agent, model) if hedge else None
+        try:
+            if delay is not None and delay < remaining:
+                result = _hedged(agent, model, attempt, remaining, delay)
+            else:
+                result = _timed(agent, model, attempt, remaining)
+        except RETRYABLE as e:
+            breaker(model).failure()
+            metrics.inc("llm_attempt_failures", agent=agent, model=model, error=type(e).__name__)
+            pause = backoff(n)
+            if n == MAX_ATTEMPTS - 1 or (can_retry and not can_retry()) or time.monotonic() + pause >= deadline:
+                raise
+            time.sleep(pause)
+            continue
+        except BaseException:
+            # Not a sign of the model's health (bad request, parse error, ...), but a
+            # half-open trial still has to end or the breaker would never let a call through
+            breaker(model).release()
+            raise
+        breaker(model).success()
+        return result
+
+
+async def acall(agent: str, model: str, attempt, deadline: float, hedge: bool = False):
+    """call() for a coroutine attempt(timeout); hedges cancel the losing attempt."""
+    deadline = time.monotonic() + deadline
+    for n in range(MAX_ATTEMPTS):
+        remaining = _check(model, deadline)
+        delay = hedge_delay(agent, model) if hedge else None
+        try:
+            if delay is not None and delay < remaining:
+                result = await _ahedged(agent, model, attempt, remaining, delay)
+            else:
+                result = await _atimed(agent, model, attempt, remaining)
+        except RETRYABLE as e:
+            breaker(model).failure()
+            metrics.inc("llm_attempt_failures", agent=agent, model=model, error=type(e).__name__)
+            pause = backoff(n)
+            if n == MAX_ATTEMPTS - 1 or time.monotonic() + pause >= deadline:
+                raise
+            await asyncio.sleep(pause)
+            continue
+        except BaseException:
+            breaker(model).release()
+            raise
+        breaker(model).success()
+        return result
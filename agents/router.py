@@ -0,0 +1,70 @@
+#Model routing - per-agent model tiers chosen under latency / cost budgets, with fallback
+
+import os
+import threading
+
+DEFAULT_MODEL = "gpt-4o-2024-08-06"
+
+# Ordered tiers per agent: primary first, then the cheaper / faster fallbacks.
+# Override with e.g. TALENTSCOUT_EVALUATOR_MODELS="gpt-4o,gpt-4o-mini".
+DEFAULT_TIERS = {
+    "info_collector": ["gpt-4o-mini", DEFAULT_MODEL],
+    "question_generator": [DEFAULT_MODEL, "gpt-4o-mini"],
+    "evaluator": [DEFAULT_MODEL, "gpt-4o-mini"],
+}
+
+# USD per 1M (input, output) tokens, for cost budgets; unknown models are treated as free
+MODEL_PRICES = {
+    "gpt-4o-2024-08-06": (2.50, 10.00),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+
+# Weight of the newest latency sample in the moving average
+EWMA_ALPHA = 0.2
+
+
+def tiers_for(agent: str) -> list:
+    prefix = f"TALENTSCOUT_{agent.upper()}_"
+    configured = os.getenv(prefix + "MODELS") or os.getenv(prefix + "MODEL") or os.getenv("TALENTSCOUT_MODEL")
+    if configured:
+        return [m.strip() for m in configured.split(",") if m.strip()]
+    return list(DEFAULT_TIERS.get(agent, [DEFAULT_MODEL]))
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    price_in, price_out = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (input_tokens * price_in + output_tokens * price_out) / 1_000_000
+
+
+class Router:
+    """Orders an agent's tiers for one request and learns per-model latency from results."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = {}       # model -> moving average seconds
+
+    def observe(self, model: str, seconds: float):
+        with self._lock:
+            previous = self.latency.get(model)
+            self.latency[model] = seconds if previous is None else previous + EWMA_ALPHA * (seconds - previous)
+
+    def plan(self, tiers: list, budget: float | None = None, max_cost: float | None = None,
+             input_tokens: int = 0, output_tokens: int = 500) -> list:
+        """
+        Tiers in the order to try them. Tiers over the cost cap are dropped
+        (the cheapest is always kept); tiers whose recent latency exceeds the
+        latency budget move behind those that fit it.
+        """
+        candidates = list(tiers)
+        if max_cost is not None:
+            affordable = [m for m in candidates if estimate_cost(m, input_tokens, output_tokens) <= max_cost]
+            candidates = affordable or [min(candidates, key=lambda m: estimate_cost(m, input_tokens, output_tokens))]
+        if budget is not None:
+            with self._lock:
+                fits = [m for m in candidates if self.latency.get(m, 0.0) <= budget]
+            candidates = fits + [m for m in candidates if m not in fits]
+        return candidates
+
+
+default_router = Router()
@@ -0,0 +1,136 @@
+#LLM call scheduler - process-wide request / token buckets shared by all sessions, granted by agent priority
+
+import asyncio
+import os
+import threading
+import time
+from itertools import count
+from agents import metrics, resilience
+
+# Lower runs first: interactive extraction, then question generation, then evaluation
+PRIORITIES = {
+    "info_collector": 0,
+    "question_generator": 1,
+    "evaluator": 2,
+}
+
+# Account quota; 0 disables a bucket
+RPM = float(os.getenv("TALENTSCOUT_RPM", 500))
+TPM = float(os.getenv("TALENTSCOUT_TPM", 150000))
+
+# A waiter moves up one priority class per AGING_SECONDS queued, so evaluation is delayed, never starved
+AGING_SECONDS = 10.0
+
+
+class TokenBucket:
+    """
+    `per_minute` units per minute, bursting up to one minute's worth. The
+    level may go negative when a charge is corrected upward.
+    """
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = per_minute
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, amount: float) -> float:
+        """Seconds until `amount` is available (0 if it already is); amount is capped at the capacity."""
+        if self.rate <= 0:
+            return 0.0
+        short = min(amount, self.capacity) - self.level
+        return max(0.0, short / self.rate)
+
+
+class Scheduler:
+    """
+    Every LLM attempt calls acquire() first. Waiters are granted strictly in
+    (aged) priority order, so a queued assessment never takes quota ahead of
+    a candidate's next turn.
+    """
+
+    def __init__(self, rpm: float = RPM, tpm: float = TPM):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self._cond = threading.Condition()
+        self._waiters = {}      # ticket -> (priority, enqueued_at, agent)
+        self._tickets = count()
+
+    def _next(self, now: float):
+        return min(
+            self._waiters,
+            key=lambda t: (self._waiters[t][0] - (now - self._waiters[t][1]) / AGING_SECONDS, t),
+        )
+
+    def _publish_depth(self):
+        depth = {}
+        for _, _, agent in self._waiters.values():
+            depth[agent] = depth.get(agent, 0) + 1
+        for agent in PRIORITIES:
+            metrics.registry.set_gauge("llm_queue_depth", depth.get(agent, 0), agent=agent)
+
+    def acquire(self, agent: str, tokens: int, timeout: float | None = None) -> float:
+        """
+        Block until this call may be sent; `tokens` is the estimated input + output size.
+        Returns the seconds spent waiting. Raises resilience.DeadlineExceeded if the
+        call is not granted within `timeout` seconds, so the caller can fall back.
+        """
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        with self._cond:
+            ticket = next(self._tickets)
+            self._waiters[ticket] = (PRIORITIES.get(agent, len(PRIORITIES)), start, agent)
+            self._publish_depth()
+            while True:
+                now = time.monotonic()
+                self.requests.refill(now)
+                self.tokens.refill(now)
+                if self._next(now) == ticket:
+                    wait = max(self.requests.wait_for(1), self.tokens.wait_for(tokens))
+                    if wait == 0:
+                        break
+                else:
+                    # Re-check periodically: aging can make this waiter the head without a grant happening
+                    wait = 1.0
+                if deadline is not None:
+                    if now >= deadline:
+                        del self._waiters[ticket]
+                        self._publish_depth()
+                        self._cond.notify_all()
+                        metrics.inc("llm_queue_timeouts", agent=agent)
+                        raise resilience.DeadlineExceeded(f"{agent}: no LLM quota within {timeout:.1f}s")
+                    wait = min(wait, deadline - now)
+                self._cond.wait(timeout=wait)
+            if self.requests.rate > 0:
+                self.requests.level -= 1
+            if self.tokens.rate > 0:
+                self.tokens.level -= tokens
+            del self._waiters[ticket]
+            self._publish_depth()
+            self._cond.notify_all()
+        metrics.observe("llm_queue_wait_seconds", now - start, agent=agent)
+        return now - start
+
+    async def aacquire(self, agent: str, tokens: int, timeout: float | None = None) -> float:
+        """acquire() for coroutines; the wait happens on the loop's default executor."""
+        return await asyncio.get_running_loop().run_in_executor(None, self.acquire, agent, tokens, timeout)
+
+    def settle(self, estimated: int, actual: int):
+        """Correct the token bucket once the response's real usage is known."""
+        if self.tokens.rate <= 0:
+            return
+        with self._cond:
+            self.tokens.level += estimated - actual
+            self._cond.notify_all()
+
+
+def estimate_tokens(input, output_tokens: int = 500) -> int:
+    """Rough size of a call: ~4 characters per input token plus the expected output."""
+    return len(str(input)) // 4 + output_tokens
+
+
+default_scheduler = Scheduler()
@@ -0,0 +1,83 @@
+#Incremental structured-output parsing - pull one string field out of a JSON document as it streams
+
+import json
+
+
+class PartialField:
+    """
+    Feed raw JSON deltas; get back the newly decoded text of one string field.
+
+    `field` names a top-level key. With `first_item=True` the field is an array
+    of strings and only its first element is followed (e.g. questions[0]).
+    """
+
+    def __init__(self, field: str, first_item: bool = False):
+        self.key = json.dumps(field)
+        self.first_item = first_item
+        self.buffer = ""
+        self.start = None       # index just past the opening quote of the value
+        self.pos = None         # decode position within buffer
+        self.done = False
+
+    def _find_start(self):
+        at = self.buffer.find(self.key)
+        if at < 0:
+            return None
+        i = at + len(self.key)
+        expected = [":", "[", '"'] if self.first_item else [":", '"']
+        while expected:
+            if i >= len(self.buffer):
+                return None
+            ch = self.buffer[i]
+            if ch.isspace():
+                i += 1
+                continue
+            if ch != expected[0]:
+                self.done = True    # not a string value; nothing to stream
+                return None
+            expected.pop(0)
+            i += 1
+        return i
+
+    def feed(self, delta: str) -> str:
+        if self.done:
+            return ""
+        self.buffer += delta
+        if self.start is None:
+            self.start = self._find_start()
+            if self.start is None:
+                return ""
+            self.pos = self.start
+
+        out = []
+        i = self.pos
+        while i < len(self.buffer):
+            ch = self.buffer[i]
+            if ch == '"':
+                self.done = True
+                break
+            if ch == "\\":
+                # Wait for the whole escape sequence before decoding it
+                size = 6 if self.buffer[i + 1:i + 2] == "u" else 2
+                if i + size > len(self.buffer):
+                    break
+                out.append(json.loads(f'"{self.buffer[i:i + size]}"'))
+                i += size
+                continue
+            out.append(ch)
+            i += 1
+        self.pos = i
+        return "".join(out)
+
+
+def field_callback(field: str, callback, first_item: bool = False):
+    """Adapt a text callback into an llm.parse on_text hook for one field (None passes through)."""
+    if callback is None:
+        return None
+    partial = PartialField(field, first_item=first_item)
+
+    def on_text(delta):
+        text = partial.feed(delta)
+        if text:
+            callback(text)
+    return on_text
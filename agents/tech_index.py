@@ -0,0 +1,51 @@
+#Tech-stack canonicalization - maps aliases and versioned names to one canonical technology
+
+import json
+import os
+import re
+
+ALIASES_PATH = os.path.join(os.path.dirname(__file__), "data", "tech_aliases.json")
+
+# Trailing versions: "Python 3.11", "React 18", "java17", "Angular 2+", "Vue v3"
+VERSION_RE = re.compile(r"[\s_-]*v?\d+(?:\.\d+|\.x)*\+?$")
+
+
+def normalize_key(name: str) -> str:
+    """Lookup key: lowercase, version stripped, separators and '.js' spellings folded."""
+    key = " ".join(str(name).lower().split())
+    key = VERSION_RE.sub("", key) or key
+    return re.sub(r"[^a-z0-9+#]", "", key)
+
+
+def load_aliases(path: str = ALIASES_PATH) -> dict:
+    """canonical name -> list of aliases, from the data file."""
+    with open(path) as f:
+        return json.load(f)
+
+
+ALIASES = load_aliases()
+
+# normalized alias key -> canonical name
+INDEX = {}
+for _canonical, _aliases in ALIASES.items():
+    for _alias in [_canonical, *_aliases]:
+        INDEX.setdefault(normalize_key(_alias), _canonical)
+
+
+def canonicalize(name: str) -> str:
+    """Canonical technology name; unknown names are kept, whitespace-normalized."""
+    return INDEX.get(normalize_key(name)) or " ".join(str(name).split())
+
+
+def canonicalize_stack(tech_stack) -> list:
+    """Canonical, de-duplicated stack in declared order."""
+    if isinstance(tech_stack, str):
+        tech_stack = tech_stack.split(",")
+    stack = []
+    for tech in tech_stack or []:
+        if not tech or not str(tech).strip():
+            continue
+        canonical = canonicalize(tech)
+        if canonical.lower() not in (t.lower() for t in stack):
+            stack.append(canonical)
+    return stack
@@ -3,7 +3,7 @@ TalentScout Screening Chatbot - Main Application Interface
 """
 
 import streamlit as st
-from orchestrator import process_chat_turn
+from orchestrator import process_chat_turn, get_session, end_session
 
 # --- 1. CONFIGURATION & SETUP ---
 st.set_page_config(
@@ -60,16 +60,11 @@ def load_css():
         </style>
     """, unsafe_allow_html=True)
 
+# Chat turns rerun only the chat fragment below, so this is injected once per full page run
 load_css()
 
 # --- 3. SESSION STATE INITIALIZATION ---
-if "openai_model" not in st.session_state:
-    st.session_state["openai_model"] = "gpt-3.5-turbo"
-if "stage" not in st.session_state:
-    st.session_state.stage = "INFO_COLLECTION"
-if "candidate_data" not in st.session_state:
-    st.session_state.candidate_data = {"name": None, "email": None}
-
+# Models are chosen per agent by agents/router.py
 # IMPROVED GREETING
 GREETING = """
 ### 👋 Welcome to TalentScout
@@ -85,17 +80,30 @@ Your responses will be shared directly with our hiring team for review.
 **Let's begin. What is your full name?**
 """
 
-if "messages" not in st.session_state:
-    st.session_state.messages = [{"role": "assistant", "content": GREETING}]
+session = get_session(greeting=GREETING)
 
 # --- 4. SIDEBAR ---
-with st.sidebar:
-    st.title("TalentScout")
-    st.markdown("---")
-    
-    # Check if the evaluation has been completed by the orchestrator
-    if "evaluation" in st.session_state:
-        eval_data = st.session_state.evaluation
+# How often the sidebar checks on a queued evaluation
+EVALUATION_POLL_SECONDS = 3
+
+def evaluation_panel(session):
+    status = session.evaluation_status()
+    if status in ("pending", "running"):
+        st.info("Evaluation in progress...")
+        st.markdown("---")
+        return
+    if status == "failed":
+        st.warning("Automatic evaluation failed; the hiring team will review your answers.")
+        st.markdown("---")
+        return
+    if st.session_state.get("evaluation_polling"):
+        # Result just arrived: one full rerun to stop polling
+        st.session_state.evaluation_polling = False
+        st.rerun(scope="app")
+
+    # Check if the evaluation has been completed by the evaluation queue
+    if session.evaluation is not None:
+        eval_data = session.evaluation
         score = eval_data.get('score', 0)
         verdict = eval_data.get('verdict', 'N/A')
         summary = eval_data.get('summary', '') # ADDED SUMMARY
@@ -114,22 +122,33 @@ with st.sidebar:
             st.markdown(f"**Assessment Summary:**\n{summary}")
             
         st.markdown("---")
+
+with st.sidebar:
+    st.title("TalentScout")
+    st.markdown("---")
+
+    # Only a queued evaluation reruns the panel on a timer
+    st.session_state.evaluation_polling = session.evaluation_status() in ("pending", "running")
+    st.fragment(
+        evaluation_panel,
+        run_every=EVALUATION_POLL_SECONDS if st.session_state.evaluation_polling else None,
+    )(session)
     
     st.subheader("Candidate Details")
-    c_name = st.session_state.candidate_data.get('name')
-    c_email = st.session_state.candidate_data.get('email')
+    c_name = session.candidate_data.get('name')
+    c_email = session.candidate_data.get('email')
     st.markdown(f"**👤 Name:** \n{c_name if c_name else '*Pending...*'}")
     st.markdown(f"**📧 Email:** \n{c_email if c_email else '*Pending...*'}")
 
     st.markdown("---")
     if st.button("End Interview", type="primary"):
-        st.session_state.stage = "CONVO_END"
+        end_session(session)
         st.rerun()
 
 # --- 5. MAIN CHAT INTERFACE ---
 st.markdown("<h1 class='main-header'>AI Screening Portal</h1>", unsafe_allow_html=True)
 
-if st.session_state.stage == "CONVO_END":
+if session.stage == "CONVO_END":
     st.markdown("""
         <div class='success-box'>
             <h3 style='color: #A7F3D0 !important; margin:0;'>Session Concluded</h3>
@@ -137,26 +156,56 @@ if st.session_state.stage == "CONVO_END":
         </div>
     """, unsafe_allow_html=True)
 
-for message in st.session_state.messages:
+# Messages older than this window are collapsed behind a toggle
+HISTORY_WINDOW = 20
+
+def render_message(message):
     avatar = "🤖" if message["role"] == "assistant" else "👤"
     with st.chat_message(message["role"], avatar=avatar):
         st.markdown(message["content"])
 
+def render_history(messages):
+    hidden = len(messages) - HISTORY_WINDOW
+    if hidden > 0:
+        if st.toggle(f"Show {hidden} earlier messages", key="show_earlier"):
+            for message in messages[:hidden]:
+                render_message(message)
+        messages = messages[hidden:]
+    for message in messages:
+        render_message(message)
+
+def sidebar_state(session):
+    return (
+        session.candidate_data.get('name'),
+        session.candidate_data.get('email'),
+        session.evaluation is not None,
+        session.stage == "CONVO_END",
+    )
+
+# History up to this full run is drawn once here; the fragment only draws what came after
+rendered = len(session.messages)
+render_history(session.messages)
+
 # --- 6. INPUT HANDLING ---
-if st.session_state.stage != "CONVO_END":
+@st.fragment
+def chat_turns(session, rendered):
+    # Each chat turn reruns only this fragment, so its cost does not grow with the history
+    for message in session.messages[rendered:]:
+        render_message(message)
+
+    if session.stage == "CONVO_END":
+        return
     if prompt := st.chat_input("Type your response..."):
-        st.session_state.messages.append({"role": "user", "content": prompt})
+        before = sidebar_state(session)
         with st.chat_message("user", avatar="👤"):
             st.markdown(prompt)
 
         with st.chat_message("assistant", avatar="🤖"):
-            response_message = process_chat_turn(
-                prompt, 
-                st.session_state.stage, 
-                st.session_state.candidate_data
-            )
+            response_message = process_chat_turn(prompt, session)
             st.write(response_message)
-        
-        st.session_state.messages.append({"role": "assistant", "content": response_message})
-        if st.session_state.stage == "CONVO_END":
-            st.rerun()
\ No newline at end of file
+
+        # Full rerun only when the sidebar changed or the fragment outgrew the window
+        if sidebar_state(session) != before or len(session.messages) - rendered > HISTORY_WINDOW:
+            st.rerun()
+
+chat_turns(session, rendered)
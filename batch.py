@@ -0,0 +1,166 @@
+"""
+TalentScout Batch Screening - headless re-run of stored transcripts through ScreeningSession
+
+Input JSONL, one candidate per line:   {"id": "c-001", "turns": ["Hi, I'm ...", "...", ...]}
+Output JSONL, one result per line:     {"id": ..., "stage": ..., "candidate_data": ..., "evaluation": ...}
+
+Usage:
+    python batch.py transcripts.jsonl results.jsonl --workers 16 --rate 5
+Re-running with the same output file skips candidates already written there.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from session import ScreeningSession
+from agents import metrics
+
+
+class RateLimiter:
+    """Token bucket shared by all workers: at most `rate` turns per second, bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def completed_ids(path: str) -> set:
+    """Ids already in the output file; the output doubles as the resume checkpoint."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["id"])
+            except (ValueError, KeyError):
+                continue    # partial last line from an interrupted run
+    return done
+
+
+async def screen(record: dict, limiter: RateLimiter) -> dict:
+    # Re-runs exist to redo extraction and evaluation, so known candidates are not short-circuited
+    session = ScreeningSession(reuse_previous=False)
+    # Stable per transcript, so a re-run replaces this candidate's stored result instead of adding one
+    session.token = f"batch:{record['id']}"
+    start = time.perf_counter()
+    for n, turn in enumerate(record["turns"]):
+        if session.stage == "CONVO_END":
+            break
+        await limiter.acquire()
+        for event in await session.step(turn):
+            if event.kind == "error":
+                raise RuntimeError(f"turn {n} failed in {session.stage}: {event.content}")
+    await session.wait_for_evaluation()
+    if session.evaluation_status() == "failed":
+        raise RuntimeError(f"evaluation job {session.evaluation_job} failed")
+    return {
+        "id": record["id"],
+        "stage": session.stage,
+        "candidate_data": session.candidate_data,
+        "questions": session.questions,
+        "answers": session.answers,
+        "evaluation": session.evaluation,
+        "extraction_paths": session.extraction_paths,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+async def run(args) -> dict:
+    done = completed_ids(args.output)
+    limiter = RateLimiter(args.rate, burst=args.workers)
+    queue = asyncio.Queue(maxsize=args.workers * 2)
+    stats = {"ok": 0, "failed": 0, "skipped": 0}
+    start = time.perf_counter()
+
+    out = open(args.output, "a")
+    errors = open(args.errors or args.output + ".errors", "a")
+
+    def report(final=False):
+        elapsed = time.perf_counter() - start
+        finished = stats["ok"] + stats["failed"]
+        per_min = finished / elapsed * 60 if elapsed else 0.0
+        print(
+            f"{'done' if final else 'progress'}: {stats['ok']} ok, {stats['failed']} failed, "
+            f"{stats['skipped']} skipped in {elapsed:.1f}s ({per_min:.1f} sessions/min)",
+            file=sys.stderr,
+        )
+
+    async def worker():
+        while True:
+            record = await queue.get()
+            if record is None:
+                return
+            try:
+                result = await screen(record, limiter)
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+                stats["ok"] += 1
+            except Exception as e:
+                errors.write(json.dumps({"id": record.get("id"), "error": repr(e)}) + "\n")
+                errors.flush()
+                stats["failed"] += 1
+            if (stats["ok"] + stats["failed"]) % args.report_every == 0:
+                report()
+
+    workers = [asyncio.create_task(worker()) for _ in range(args.workers)]
+    with open(args.input) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record["id"] in done:
+                stats["skipped"] += 1
+                continue
+            await queue.put(record)
+    for _ in workers:
+        await queue.put(None)
+    await asyncio.gather(*workers)
+
+    out.close()
+    errors.close()
+    report(final=True)
+    if args.metrics_prom:
+        metrics.registry.write_prometheus(args.metrics_prom)
+    if args.metrics_jsonl:
+        metrics.registry.flush_jsonl(args.metrics_jsonl)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-run stored candidate transcripts without Streamlit.")
+    parser.add_argument("input", help="JSONL transcripts: {\"id\": ..., \"turns\": [...]}")
+    parser.add_argument("output", help="JSONL results (appended; also the resume checkpoint)")
+    parser.add_argument("--errors", help="JSONL for failed candidates (default: <output>.errors)")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent sessions")
+    parser.add_argument("--rate", type=float, default=0, help="max candidate turns per second (0 = unlimited)")
+    parser.add_argument("--report-every", type=int, default=100, help="progress line every N sessions")
+    parser.add_argument("--metrics-prom", help="write Prometheus text metrics here when done")
+    parser.add_argument("--metrics-jsonl", help="append per-observation latency records here when done")
+    args = parser.parse_args(argv)
+
+    stats = asyncio.run(run(args))
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+TalentScout Benchmark - drive simulated candidates through ScreeningSession against the fake LLM backend
+
+Usage:
+    python bench.py --sessions 200 --concurrency 50 --scale 0.1 --out bench.json
+Same --seed and flags give comparable numbers across commits; the report records the commit.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from agents import llm, metrics, question_cache, scheduler
+from agents.fake_llm import FakeBackend, Latency
+import candidate_index
+import evaluation_queue
+import results_store
+from session import ScreeningSession, STAGES
+
+STACKS = [
+    ["Python", "Django", "PostgreSQL"],
+    ["React", "TypeScript", "Node.js"],
+    ["Java", "Spring", "Kafka"],
+    ["Go", "Docker", "Kubernetes"],
+    ["Python", "Pandas", "Spark"],
+    ["C#", ".NET", "Azure"],
+]
+ROLES = ["Backend Engineer", "Frontend Engineer", "Data Engineer", "SRE"]
+
+# Seconds (median, p99) per structured output type, before --scale
+DEFAULT_LATENCY = {
+    "Info": (0.8, 2.5),
+    "TechQuestionPools": (3.0, 8.0),
+    "AnswerScore": (1.0, 3.0),
+    "EvaluationResult": (4.0, 10.0),
+}
+
+
+def candidate_turns(i: int, rng: random.Random) -> list:
+    """A scripted candidate: profile over three messages, then five answers."""
+    stack = rng.choice(STACKS)
+    return [
+        f"name: Candidate {i}; loc: City {i % 50}",
+        f"candidate{i}@example.com, +1 555 {100 + i % 900} {1000 + i % 9000}, {rng.randint(0, 10)} years",
+        f"desired_positions: {rng.choice(ROLES)}; tech_stack: {', '.join(stack)}",
+    ] + [rng.choice(["pass", "It uses a hash map internally.", "idk", "By adding an index."]) for _ in range(5)]
+
+
+def percentiles(name: str, **labels) -> dict:
+    return {
+        f"p{int(q * 100)}": round(metrics.registry.percentile(name, q, **labels) or 0.0, 4)
+        for q in (0.5, 0.95, 0.99)
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+async def run(args) -> dict:
+    rng = random.Random(args.seed)
+    backend = FakeBackend(
+        latency={name: Latency(m * args.scale, p * args.scale) for name, (m, p) in DEFAULT_LATENCY.items()},
+        seed=args.seed,
+    )
+    llm.set_backend(backend)
+    scheduler.default_scheduler = scheduler.Scheduler(rpm=args.rpm, tpm=args.tpm)
+
+    # Fresh caches and stores per run so results do not depend on earlier runs
+    workdir = tempfile.mkdtemp(prefix="talentscout-bench-")
+    question_cache.default_cache = question_cache.QuestionCache(path=f"{workdir}/questions.sqlite3")
+    results_store.default_store = results_store.ResultsStore(path=f"{workdir}/results.sqlite3")
+    candidate_index.default_index = candidate_index.CandidateIndex(path=f"{workdir}/candidates.sqlite3")
+    evaluation_queue.default_queue = evaluation_queue.EvaluationQueue(
+        path=f"{workdir}/eval_jobs.sqlite3", workers=args.eval_workers
+    )
+    metrics.registry.reset()
+
+    scripts = [candidate_turns(i, rng) for i in range(args.sessions)]
+    limit = asyncio.Semaphore(args.concurrency)
+    sessions = []
+
+    async def candidate(turns):
+        async with limit:
+            session = ScreeningSession()
+            sessions.append(session)
+            for turn in turns:
+                if session.stage == "CONVO_END":
+                    break
+                await session.step(turn)
+                if args.think:
+                    await asyncio.sleep(args.think)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(candidate(turns) for turns in scripts))
+    elapsed = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Evaluations finish after the conversations; timed separately
+    evaluation_queue.default_queue.drain()
+    drained = time.perf_counter() - start
+    results_store.default_store.flush()
+
+    completed = sum(1 for s in sessions if s.stage == "CONVO_END")
+    llm_calls = sum(v for (name, _), v in metrics.registry.counters.items() if name == "llm_calls")
+    return {
+        "commit": git_commit(),
+        "params": vars(args),
+        "sessions": args.sessions,
+        "completed": completed,
+        "elapsed_seconds": round(elapsed, 3),
+        "evaluations_drained_seconds": round(drained, 3),
+        "sessions_per_second": round(args.sessions / elapsed, 3),
+        "memory_per_session_bytes": memory // max(1, args.sessions),
+        "llm_calls_per_screening": round(llm_calls / max(1, args.sessions), 3),
+        "stage_latency": {stage: percentiles("stage_seconds", stage=stage) for stage in STAGES[:-1]},
+        "turn_latency": {stage: percentiles("turn_seconds", stage=stage) for stage in ("INFO_COLLECTION", "ASK_QUESTIONS")},
+        "eval_job_wait": percentiles("eval_job_wait_seconds"),
+        "queue_wait": {agent: percentiles("llm_queue_wait_seconds", agent=agent) for agent in scheduler.PRIORITIES},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline load test of the screening flow.")
+    parser.add_argument("--sessions", type=int, default=100, help="simulated candidates")
+    parser.add_argument("--concurrency", type=int, default=25, help="candidates in flight at once")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply fake LLM latencies (0 = instant)")
+    parser.add_argument("--think", type=float, default=0.0, help="candidate pause between turns, seconds")
+    parser.add_argument("--eval-workers", type=int, default=evaluation_queue.WORKERS, help="evaluation queue workers")
+    parser.add_argument("--rpm", type=float, default=0, help="simulated requests-per-minute quota (0 = unlimited)")
+    parser.add_argument("--tpm", type=float, default=0, help="simulated tokens-per-minute quota (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="also write the JSON report here")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    return 0 if report["completed"] == args.sessions else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+TalentScout Candidate Index - returning-candidate lookup by hashed email / phone, with the last question set
+
+A contact match is not proof of identity, so the index holds nothing worth showing or
+reusing without verification: no profile and no evaluation, only the question set, the
+(stack, YoE band) signature it was generated for, and whether that screening was finished.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from agents import question_cache
+
+INDEX_PATH = os.getenv("TALENTSCOUT_CANDIDATE_INDEX", "data/candidates.sqlite3")
+# Prior questions are reused only if the last screening is this recent
+REUSE_WINDOW = float(os.getenv("TALENTSCOUT_REUSE_DAYS", 30)) * 24 * 3600
+# Mixed into the identity hashes so the index cannot be joined against raw contact lists
+SALT = os.getenv("TALENTSCOUT_INDEX_SALT", "talentscout")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY,
+    updated_at REAL NOT NULL,
+    screened_at REAL,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS candidate_keys (
+    key TEXT PRIMARY KEY,
+    candidate_id INTEGER NOT NULL REFERENCES candidates (id)
+);
+"""
+
+
+def normalize_email(email) -> str | None:
+    return str(email).strip().lower() if email else None
+
+
+def normalize_phone(phone) -> str | None:
+    """Last 10 digits, so '+1 (555) 123-4567' and '5551234567' match."""
+    digits = re.sub(r"\D", "", str(phone or ""))
+    return digits[-10:] if len(digits) >= 7 else None
+
+
+def identity_keys(candidate_data: dict) -> list:
+    keys = []
+    email = normalize_email(candidate_data.get("email"))
+    phone = normalize_phone(candidate_data.get("phone"))
+    if email:
+        keys.append(hashlib.sha256(f"{SALT}|email|{email}".encode()).hexdigest())
+    if phone:
+        keys.append(hashlib.sha256(f"{SALT}|phone|{phone}".encode()).hexdigest())
+    return keys
+
+
+class CandidateIndex:
+    """
+    One record per candidate ({'signature', 'questions', 'finished'}),
+    reachable from the hash of each email / phone it was seen with.
+    """
+
+    def __init__(self, path: str = INDEX_PATH, reuse_window: float = REUSE_WINDOW):
+        self.path = path
+        self.reuse_window = reuse_window
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _find(self, keys: list):
+        if not keys:
+            return None
+        return self._db().execute(
+            "SELECT c.id, c.updated_at, c.screened_at, c.record FROM candidate_keys k "
+            f"JOIN candidates c ON c.id = k.candidate_id WHERE k.key IN ({','.join('?' * len(keys))}) "
+            "ORDER BY c.updated_at DESC LIMIT 1",
+            keys,
+        ).fetchone()
+
+    def lookup(self, candidate_data: dict) -> dict | None:
+        """
+        The candidate's last record, with 'fresh' set when its questions are
+        recent enough to reuse; None for a new candidate.
+        """
+        with self._lock:
+            row = self._find(identity_keys(candidate_data))
+        if row is None:
+            return None
+        record = json.loads(row[3])
+        record["fresh"] = time.time() - (row[2] or row[1]) < self.reuse_window
+        return record
+
+    def remember(self, candidate_data: dict, questions: list):
+        """Record the question set just generated for the candidate's stack and YoE band."""
+        keys = identity_keys(candidate_data)
+        if not keys:
+            return
+        now = time.time()
+        # Replaces the whole record, so data from older layouts (profiles, evaluations) is dropped
+        record = json.dumps({
+            "signature": question_cache.signature(candidate_data), "questions": questions, "finished": False,
+        })
+        with self._lock:
+            db = self._db()
+            with db:
+                row = self._find(keys)
+                if row is None:
+                    candidate_id = db.execute(
+                        "INSERT INTO candidates (updated_at, screened_at, record) VALUES (?, ?, ?)",
+                        (now, now, record),
+                    ).lastrowid
+                else:
+                    candidate_id = row[0]
+                    db.execute(
+                        "UPDATE candidates SET updated_at = ?, screened_at = ?, record = ? WHERE id = ?",
+                        (now, now, record, candidate_id),
+                    )
+                db.executemany(
+                    "INSERT OR REPLACE INTO candidate_keys (key, candidate_id) VALUES (?, ?)",
+                    [(key, candidate_id) for key in keys],
+                )
+
+    def finish(self, candidate_data: dict):
+        """Mark the candidate's last question set as answered, so it is not handed out again."""
+        keys = identity_keys(candidate_data)
+        if not keys:
+            return
+        with self._lock:
+            db = self._db()
+            with db:
+                row = self._find(keys)
+                if row is None:
+                    return
+                record = json.loads(row[3])
+                record["finished"] = True
+                db.execute(
+                    "UPDATE candidates SET updated_at = ?, record = ? WHERE id = ?",
+                    (time.time(), json.dumps(record), row[0]),
+                )
+
+
+default_index = CandidateIndex()
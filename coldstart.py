@@ -0,0 +1,87 @@
+"""
+TalentScout Cold Start Profile - import time of the app's entry modules in fresh interpreters
+
+Usage:
+    python coldstart.py --runs 5 --out coldstart.json
+    python coldstart.py --module session --max-ms 300     # exit 1 if the median exceeds the budget
+Reports the median cumulative import time per module and the slowest imports, tagged with the commit.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from bench import git_commit
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Entry points a fresh Streamlit worker / batch run imports
+DEFAULT_MODULES = ["orchestrator", "session", "batch"]
+
+
+def import_profile(module: str) -> dict:
+    """{imported module: cumulative microseconds} from one `python -X importtime` run."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=ROOT,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def profile_module(module: str, runs: int, top: int) -> dict:
+    profiles = [import_profile(module) for _ in range(runs)]
+    totals = [p[module] / 1000 for p in profiles]
+    # Slowest direct-or-indirect imports by median cumulative time, excluding the module itself
+    names = set().union(*profiles) - {module}
+    slowest = sorted(
+        ((name, statistics.median(p.get(name, 0) for p in profiles) / 1000) for name in names),
+        key=lambda item: item[1], reverse=True,
+    )[:top]
+    return {
+        "median_ms": round(statistics.median(totals), 1),
+        "min_ms": round(min(totals), 1),
+        "max_ms": round(max(totals), 1),
+        "slowest_imports_ms": {name: round(ms, 1) for name, ms in slowest},
+        "loads_openai": any("openai" in p for p in profiles),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile cold-start import time of the app modules.")
+    parser.add_argument("--module", action="append", help="module to profile (repeatable; default: app entry points)")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list per module")
+    parser.add_argument("--max-ms", type=float, help="fail if any module's median exceeds this")
+    parser.add_argument("--out", help="also write the JSON report here")
+    args = parser.parse_args(argv)
+
+    modules = args.module or DEFAULT_MODULES
+    report = {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "modules": {module: profile_module(module, args.runs, args.top) for module in modules},
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    if args.max_ms is not None and any(m["median_ms"] > args.max_ms for m in report["modules"].values()):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
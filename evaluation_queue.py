@@ -0,0 +1,282 @@
+"""
+TalentScout Evaluation Queue - durable SQLite job queue that evaluates finished screenings off the chat path
+
+Jobs survive restarts: pending jobs are picked up again when workers start, and a job whose
+worker died mid-run is reclaimed once its lease expires.
+Run extra worker processes against the same database with:
+    python evaluation_queue.py --workers 4
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import agents
+from agents import metrics
+import results_store
+
+logger = logging.getLogger(__name__)
+
+QUEUE_PATH = os.getenv("TALENTSCOUT_EVAL_QUEUE", "data/eval_jobs.sqlite3")
+WORKERS = int(os.getenv("TALENTSCOUT_EVAL_WORKERS", 2))
+MAX_ATTEMPTS = 5
+RETRY_DELAY = 10.0      # seconds, doubled per failed attempt
+POLL_INTERVAL = 0.5     # idle worker sleep between claims
+# A claimed job belongs to its worker this long; after that another worker may reclaim it.
+# Must exceed the longest evaluation (a few LLM calls, each within its own deadline).
+LEASE_SECONDS = float(os.getenv("TALENTSCOUT_EVAL_LEASE", 600))
+# How long a job is held back for per-answer scores the session is still computing
+SCORE_GRACE = float(os.getenv("TALENTSCOUT_EVAL_SCORE_GRACE", 5))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS eval_jobs (
+    id INTEGER PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'pending',     -- pending | running | done | failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    claimed_at REAL,                            -- start of the running worker's lease
+    payload TEXT NOT NULL,
+    evaluation TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_eval_jobs_claim ON eval_jobs (status, available_at);
+"""
+
+
+def evaluate(payload: dict) -> dict:
+    """
+    Aggregate the per-answer scores, scoring any answer the session did not
+    get a score for; falls back to one full assessment if scoring fails.
+    """
+    candidate_data = payload["candidate_data"]
+    questions, answers = payload["questions"], payload["answers"]
+    known = payload.get("answer_scores") or {}
+    try:
+        scores = [
+            known.get(q) or agents.evaluator.answer_scoring_agent(candidate_data, q, answers.get(q, ""))
+            for q in questions
+        ]
+    except Exception:
+        logger.warning("per-answer scoring failed; running a full assessment", exc_info=True)
+        return agents.evaluator.assessment_agent(candidate_data, questions, answers)
+    return agents.evaluator.aggregate_evaluation(scores)
+
+
+class EvaluationQueue:
+    """
+    enqueue() is one INSERT, so ending a screening never waits on the LLM.
+    Worker threads claim jobs one at a time inside an IMMEDIATE transaction,
+    so any number of threads and processes can share one database.
+    """
+
+    def __init__(self, path: str = QUEUE_PATH, workers: int = WORKERS):
+        self.path = path
+        self.workers = workers
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            if "claimed_at" not in {row[1] for row in conn.execute("PRAGMA table_info(eval_jobs)")}:
+                conn.execute("ALTER TABLE eval_jobs ADD COLUMN claimed_at REAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def start(self):
+        """Start the worker threads (once). Jobs a dead worker left running are reclaimed by _claim()."""
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work_loop, name=f"eval-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def enqueue(self, payload: dict, delay: float = 0.0) -> int:
+        """
+        Queue a finished screening (result_record() plus answer_scores) and
+        return its job id. Workers leave it alone for `delay` seconds.
+        """
+        self.start()
+        now = time.time()
+        cursor = self._conn().execute(
+            "INSERT INTO eval_jobs (available_at, created_at, updated_at, payload) VALUES (?, ?, ?, ?)",
+            (now + delay, now, now, json.dumps(payload)),
+        )
+        metrics.inc("eval_jobs", status="queued")
+        return cursor.lastrowid
+
+    def add_answer_score(self, job_id: int, question: str, score: dict) -> bool:
+        """Attach a late per-answer score to a job not yet claimed; False if a worker already has it."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT payload FROM eval_jobs WHERE id = ? AND status = 'pending'", (job_id,)
+            ).fetchone()
+            if row is not None:
+                payload = json.loads(row["payload"])
+                payload.setdefault("answer_scores", {})[question] = score
+                conn.execute(
+                    "UPDATE eval_jobs SET payload = ?, updated_at = ? WHERE id = ?",
+                    (json.dumps(payload), time.time(), job_id),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return row is not None
+
+    def release(self, job_id: int):
+        """Make a held-back job available to workers now."""
+        self._conn().execute(
+            "UPDATE eval_jobs SET available_at = ? WHERE id = ? AND status = 'pending'", (time.time(), job_id)
+        )
+
+    def status(self, job_id: int) -> dict | None:
+        """{'status', 'attempts', 'evaluation', 'error'} for a job, or None if unknown."""
+        row = self._conn().execute(
+            "SELECT status, attempts, evaluation, error FROM eval_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "status": row["status"],
+            "attempts": row["attempts"],
+            "evaluation": json.loads(row["evaluation"]) if row["evaluation"] else None,
+            "error": row["error"],
+        }
+
+    def pending(self) -> int:
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM eval_jobs WHERE status IN ('pending', 'running')"
+        ).fetchone()[0]
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Wait until no job is pending or running; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(POLL_INTERVAL / 5)
+        return True
+
+    def _claim(self):
+        """Take the next due job, or a running one whose worker's lease has expired."""
+        conn = self._conn()
+        now = time.time()
+        expired = now - LEASE_SECONDS
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # A job whose workers keep dying is given up on like one that keeps failing
+            conn.execute(
+                "UPDATE eval_jobs SET status = 'failed', updated_at = ?, error = 'lease expired' "
+                "WHERE status = 'running' AND COALESCE(claimed_at, 0) < ? AND attempts >= ?",
+                (now, expired, MAX_ATTEMPTS),
+            )
+            row = conn.execute(
+                "SELECT id, attempts, payload, created_at FROM eval_jobs "
+                "WHERE (status = 'pending' AND available_at <= ?) "
+                "OR (status = 'running' AND COALESCE(claimed_at, 0) < ?) ORDER BY id LIMIT 1",
+                (now, expired),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE eval_jobs SET status = 'running', attempts = attempts + 1, claimed_at = ?, updated_at = ? "
+                    "WHERE id = ?",
+                    (now, now, row["id"]),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return row
+
+    def _work_loop(self):
+        while True:
+            try:
+                job = self._claim()
+            except sqlite3.Error:
+                logger.exception("could not claim an evaluation job")
+                job = None
+            if job is None:
+                time.sleep(POLL_INTERVAL)
+                continue
+            try:
+                self._run(job)
+            except Exception as e:
+                # Anything past evaluate() (storing the result, the final UPDATE) must not kill the worker
+                logger.exception("evaluation job %s failed", job["id"])
+                try:
+                    self._fail(job, e)
+                except sqlite3.Error:
+                    logger.exception("could not record the failure of evaluation job %s", job["id"])
+
+    def _fail(self, job, error: Exception):
+        """Retry the job after a backoff, or mark it failed once it is out of attempts."""
+        attempts = job["attempts"] + 1
+        status = "failed" if attempts >= MAX_ATTEMPTS else "pending"
+        self._conn().execute(
+            "UPDATE eval_jobs SET status = ?, available_at = ?, updated_at = ?, error = ? WHERE id = ?",
+            (status, time.time() + RETRY_DELAY * 2 ** (attempts - 1), time.time(), repr(error), job["id"]),
+        )
+        metrics.inc("eval_jobs", status="failed" if status == "failed" else "retried")
+
+    def _run(self, job):
+        conn = self._conn()
+        payload = json.loads(job["payload"])
+        metrics.observe("eval_job_wait_seconds", time.time() - job["created_at"])
+        try:
+            with metrics.span("eval_job"):
+                evaluation = evaluate(payload)
+        except Exception as e:
+            logger.warning("evaluation job %s attempt %d failed: %s", job["id"], job["attempts"] + 1, e)
+            self._fail(job, e)
+            return
+
+        record = {k: v for k, v in payload.items() if k != "answer_scores"}
+        record["evaluation"] = evaluation
+        results_store.default_store.submit(record)
+        conn.execute(
+            "UPDATE eval_jobs SET status = 'done', evaluation = ?, updated_at = ?, error = NULL WHERE id = ?",
+            (json.dumps(evaluation), time.time(), job["id"]),
+        )
+        metrics.inc("eval_jobs", status="done")
+
+
+default_queue = EvaluationQueue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run evaluation workers against the shared job queue.")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--db", default=QUEUE_PATH)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    queue = EvaluationQueue(path=args.db, workers=args.workers)
+    queue.start()
+    logger.info("%d evaluation workers on %s", args.workers, args.db)
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
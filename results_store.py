@@ -0,0 +1,220 @@
+"""
+TalentScout Results Store - indexed SQLite store for completed screenings with write-behind batching
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from agents import tech_index
+
+logger = logging.getLogger(__name__)
+
+RESULTS_PATH = os.getenv("TALENTSCOUT_RESULTS_DB", "data/results.sqlite3")
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 0.5    # seconds a partial batch may wait before it is written
+WRITE_ATTEMPTS = 3      # tries for a whole batch (e.g. "database is locked") before per-record fallback
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS screenings (
+    id INTEGER PRIMARY KEY,
+    completed_at REAL NOT NULL,
+    name TEXT,
+    email TEXT,
+    verdict TEXT,
+    score INTEGER,
+    payload TEXT NOT NULL,
+    screening_key TEXT                  -- stable id of the screening; a re-run replaces its row
+);
+CREATE INDEX IF NOT EXISTS idx_screenings_email ON screenings (email);
+CREATE INDEX IF NOT EXISTS idx_screenings_verdict_score ON screenings (verdict, score DESC);
+CREATE INDEX IF NOT EXISTS idx_screenings_score ON screenings (score DESC);
+
+CREATE TABLE IF NOT EXISTS screening_tech (
+    tech TEXT NOT NULL,
+    score INTEGER,
+    screening_id INTEGER NOT NULL REFERENCES screenings (id)
+);
+CREATE INDEX IF NOT EXISTS idx_screening_tech ON screening_tech (tech, score DESC, screening_id);
+"""
+
+
+def normalize_tech(tech: str) -> str:
+    """Index key: the canonical technology name, lowercased, so 'ReactJS' and 'react 18' share one key."""
+    return tech_index.canonicalize(tech).lower()
+
+
+def normalize_email(email) -> str | None:
+    return email.strip().lower() if email else None
+
+
+class ResultsStore:
+    """
+    submit() only enqueues, so persisting never blocks a chat turn; a single
+    writer thread commits queued records in batches. Queries read directly.
+    """
+
+    def __init__(self, path: str = RESULTS_PATH):
+        self.path = path
+        self._queue = queue.Queue()
+        self._writer = None
+        self._start_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        if "screening_key" not in {row[1] for row in conn.execute("PRAGMA table_info(screenings)")}:
+            conn.execute("ALTER TABLE screenings ADD COLUMN screening_key TEXT")
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_screenings_key ON screenings (screening_key)")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def submit(self, record: dict):
+        """
+        Queue a completed screening (candidate_data, questions, answers, evaluation,
+        screening_key). A record with a screening_key already stored replaces that row.
+        """
+        if self._writer is None:
+            with self._start_lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._write_loop, name="results-writer", daemon=True)
+                    self._writer.start()
+                    atexit.register(self.flush)
+        self._queue.put(record)
+
+    def flush(self):
+        """Block until every submitted record is committed."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def _write_loop(self):
+        conn = self._connect()
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(conn, batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: list):
+        """
+        Commit the batch in one transaction, retrying transient failures with
+        backoff; if it still fails, insert record by record so one bad record
+        (or a lock that outlives the retries) only loses itself.
+        """
+        for attempt in range(WRITE_ATTEMPTS):
+            try:
+                with conn:
+                    for record in batch:
+                        self._insert(conn, record)
+                return
+            except sqlite3.OperationalError:
+                logger.warning("batch of %d screening results failed (attempt %d)", len(batch), attempt + 1, exc_info=True)
+                time.sleep(0.1 * 2 ** attempt)
+            except Exception:
+                logger.warning("batch of %d screening results failed", len(batch), exc_info=True)
+                break
+        for record in batch:
+            for attempt in range(WRITE_ATTEMPTS):
+                try:
+                    with conn:
+                        self._insert(conn, record)
+                    break
+                except sqlite3.OperationalError:
+                    if attempt == WRITE_ATTEMPTS - 1:
+                        logger.exception("dropped screening result %s", record.get("screening_key"))
+                    else:
+                        time.sleep(0.1 * 2 ** attempt)
+                except Exception:
+                    logger.exception("dropped screening result %s", record.get("screening_key"))
+                    break
+
+    def _insert(self, conn: sqlite3.Connection, record: dict):
+        candidate = record.get("candidate_data") or {}
+        evaluation = record.get("evaluation") or {}
+        score = evaluation.get("score")
+        key = record.get("screening_key")
+        if key is not None:
+            previous = conn.execute("SELECT id FROM screenings WHERE screening_key = ?", (key,)).fetchone()
+            if previous is not None:
+                conn.execute("DELETE FROM screening_tech WHERE screening_id = ?", (previous[0],))
+                conn.execute("DELETE FROM screenings WHERE id = ?", (previous[0],))
+        cursor = conn.execute(
+            "INSERT INTO screenings (completed_at, name, email, verdict, score, payload, screening_key) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                record.get("completed_at", time.time()),
+                candidate.get("name"),
+                normalize_email(candidate.get("email")),
+                evaluation.get("verdict"),
+                score,
+                json.dumps(record),
+                key,
+            ),
+        )
+        techs = {normalize_tech(t) for t in candidate.get("tech_stack") or [] if t}
+        conn.executemany(
+            "INSERT INTO screening_tech (tech, score, screening_id) VALUES (?, ?, ?)",
+            [(tech, score, cursor.lastrowid) for tech in techs],
+        )
+
+    # --- Queries ---
+
+    def _rows(self, sql: str, params: tuple) -> list:
+        return [
+            {"id": row["id"], "completed_at": row["completed_at"], **json.loads(row["payload"])}
+            for row in self._reader().execute(sql, params)
+        ]
+
+    def top_k(self, tech: str, k: int = 10, verdict: str | None = None) -> list:
+        """Highest-scoring screenings that declared `tech`, best first."""
+        sql = (
+            "SELECT s.id, s.completed_at, s.payload FROM screening_tech t "
+            "JOIN screenings s ON s.id = t.screening_id WHERE t.tech = ?"
+        )
+        params = (normalize_tech(tech),)
+        if verdict:
+            sql += " AND s.verdict = ?"
+            params += (verdict,)
+        return self._rows(sql + " ORDER BY t.score DESC LIMIT ?", params + (k,))
+
+    def by_email(self, email: str) -> list:
+        return self._rows(
+            "SELECT id, completed_at, payload FROM screenings WHERE email = ? ORDER BY completed_at DESC",
+            (normalize_email(email),),
+        )
+
+    def by_verdict(self, verdict: str, limit: int = 100) -> list:
+        return self._rows(
+            "SELECT id, completed_at, payload FROM screenings WHERE verdict = ? ORDER BY score DESC LIMIT ?",
+            (verdict, limit),
+        )
+
+    def count(self) -> int:
+        return self._reader().execute("SELECT COUNT(*) FROM screenings").fetchone()[0]
+
+
+default_store = ResultsStore()
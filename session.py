@@ -0,0 +1,460 @@
+"""
+TalentScout Screening Session - Streamlit-independent interview state machine
+"""
+
+import asyncio
+import logging
+import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, NamedTuple, Optional
+import agents
+from agents import question_cache, metrics
+import candidate_index
+import evaluation_queue
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_FIELDS = ["name", "email", "phone", "yoe", "desired_positions", "loc", "tech_stack"]
+
+FIELD_LABELS = {
+     "name":"name",
+     "email": "email address",
+     "phone": "phone number",
+     "yoe": "years of experience",
+     "desired_positions": "desired role",
+     "loc": "current location",
+     "tech_stack": "technology stack"
+}
+
+# Question generation only depends on these, so it can start before the profile is complete
+QUESTION_INPUTS = ["tech_stack", "yoe"]
+
+STAGES = ["INFO_COLLECTION", "QUESTION_GENERATION", "ASK_QUESTIONS", "ASSESSMENT", "CONVO_END"]
+
+# Bump when the snapshot layout changes; older snapshots are then not restored
+SNAPSHOT_VERSION = 1
+
+INSTRUCTIONS = (
+    "**Profile Complete! Moving to Technical Assessment.**\n\n"
+    "**Instructions:**\n"
+    "- I will generate technical questions based on your stack.\n"
+    "- Answer clearly and concisely.\n"
+    "- If you don't know an answer, simply type 'Pass'.\n\n"
+    "Generating your unique questions now..."
+)
+
+# Shown when an agent call fails for good; the stage is left as it was so the next message retries it
+UNAVAILABLE = (
+    "Sorry, I'm having trouble reaching our screening service right now. "
+    "Please send your last message again in a moment."
+)
+
+CLOSING = ("""
+            Thank you for completing the screening.
+
+            Your responses have been recorded and will be reviewed by our hiring team.
+            If your profile matches our requirements, we will reach out shortly.
+
+            **Screening Complete.**
+        """)
+
+# Shared by all sessions in this process for blocking agent calls. Each call holds a
+# thread for its whole LLM round trip, so this caps concurrent agent calls per process.
+AGENT_THREADS = int(os.getenv("TALENTSCOUT_AGENT_THREADS", 32))
+executor = ThreadPoolExecutor(max_workers=AGENT_THREADS, thread_name_prefix="talentscout")
+
+# Evaluator-class calls get their own pool: they wait longest for quota (lowest
+# scheduler priority) and would otherwise hold the threads interactive turns need.
+SCORING_AGENTS = ("answer_scoring",)
+SCORING_THREADS = int(os.getenv("TALENTSCOUT_SCORING_THREADS", 8))
+scoring_executor = ThreadPoolExecutor(max_workers=SCORING_THREADS, thread_name_prefix="talentscout-scoring")
+
+
+class Event(NamedTuple):
+    kind: str       # "notice" (shown before the turn finishes) | "reply" | "stage"
+                    # | "partial_question" (streamed text deltas) | "error" (the turn failed)
+    content: str
+
+# Event kinds that become part of the chat history
+MESSAGE_KINDS = ("notice", "reply")
+
+
+def is_complete(candidate_data: dict) -> bool:
+     return all(candidate_data.get(field) not in (None, [], "") for field in REQUIRED_FIELDS)
+
+
+def missing_fields(candidate_data: dict) -> list:
+    return [f for f in REQUIRED_FIELDS if candidate_data.get(f) in (None, [], "")]
+
+
+def submit(agent: str, fn, *args):
+    """Run an agent call on the shared executor (scoring_executor for SCORING_AGENTS), timed into the agent_seconds histogram."""
+    def timed():
+        with metrics.span("agent", agent=agent):
+            return fn(*args)
+    return (scoring_executor if agent in SCORING_AGENTS else executor).submit(timed)
+
+
+async def run_blocking(agent: str, fn, *args):
+    return await asyncio.wrap_future(submit(agent, fn, *args))
+
+
+async def run_streaming(agent: str, fn, *args, on_partial):
+    """
+    run_blocking for agents that take a trailing text callback. Deltas produced
+    on the worker thread are handed to on_partial on the event loop thread.
+    """
+    loop = asyncio.get_running_loop()
+    deltas = asyncio.Queue()
+
+    def on_text(text):
+        loop.call_soon_threadsafe(deltas.put_nowait, text)
+
+    future = asyncio.wrap_future(submit(agent, fn, *args, on_text))
+    while not future.done():
+        getter = asyncio.ensure_future(deltas.get())
+        await asyncio.wait({getter, future}, return_when=asyncio.FIRST_COMPLETED)
+        if getter.done():
+            on_partial(getter.result())
+        else:
+            getter.cancel()
+    while not deltas.empty():
+        on_partial(deltas.get_nowait())
+    return future.result()
+
+
+class ScreeningSession:
+    """
+    One candidate interview: INFO_COLLECTION -> QUESTION_GENERATION -> ASK_QUESTIONS
+    -> ASSESSMENT -> CONVO_END. Holds no UI state; drive it with `await step(text)`.
+    """
+
+    __slots__ = (
+        "token", "stage", "candidate_data", "questions", "current_question_index", "answers",
+        "evaluation", "evaluation_job", "messages", "extraction_paths",
+        "returning", "reuse_previous",
+        "_question_future", "_question_key", "_answer_scores",
+    )
+
+    def __init__(self, greeting: Optional[str] = None, reuse_previous: bool = True):
+        self.token = secrets.token_urlsafe(16)
+        self.stage = "INFO_COLLECTION"
+        self.candidate_data = {"name": None, "email": None}
+        self.questions = []
+        self.current_question_index = 0
+        self.answers = {}
+        self.evaluation = None
+        self.evaluation_job = None
+        self.messages = [{"role": "assistant", "content": greeting}] if greeting else []
+        self.extraction_paths = []
+        self.returning = None       # candidate_index record; {} once looked up and not found
+        # Off for re-runs (batch.py): every step is redone and the candidate index is neither read nor written
+        self.reuse_previous = reuse_previous
+        self._question_future = None
+        self._question_key = None
+        self._answer_scores = {}
+
+    def end(self):
+        self.stage = "CONVO_END"
+
+    def result_record(self) -> dict:
+        return {
+            "screening_key": self.token,
+            "completed_at": time.time(),
+            "candidate_data": dict(self.candidate_data),
+            "questions": list(self.questions),
+            "answers": dict(self.answers),
+            "evaluation": self.evaluation,
+        }
+
+    def snapshot(self) -> dict:
+        """
+        Compact, JSON-safe state for session_store. Answers are stored by
+        question index; background work in flight (speculative questions,
+        per-answer scores) is not kept and is redone or left to the evaluation job.
+        """
+        return {
+            "v": SNAPSHOT_VERSION,
+            "t": self.token,
+            "s": STAGES.index(self.stage),
+            "c": {k: v for k, v in self.candidate_data.items() if v not in (None, [], "")},
+            "q": self.questions,
+            "i": self.current_question_index,
+            "a": [self.answers.get(q) for q in self.questions[:self.current_question_index]],
+            "e": self.evaluation,
+            "j": self.evaluation_job,
+            "m": [[m["role"][0], m["content"]] for m in self.messages],
+            "x": self.extraction_paths,
+            "r": self.returning,
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: dict) -> Optional["ScreeningSession"]:
+        """Rebuild a session from snapshot(); None if the snapshot is from another layout version."""
+        if data.get("v") != SNAPSHOT_VERSION:
+            return None
+        session = cls()
+        session.token = data["t"]
+        session.stage = STAGES[data["s"]]
+        session.candidate_data.update(data["c"])
+        session.questions = data["q"]
+        session.current_question_index = data["i"]
+        session.answers = {q: a for q, a in zip(session.questions, data["a"]) if a is not None}
+        session.evaluation = data["e"]
+        session.evaluation_job = data["j"]
+        session.messages = [
+            {"role": "user" if role == "u" else "assistant", "content": content} for role, content in data["m"]
+        ]
+        session.extraction_paths = data["x"]
+        session.returning = data.get("r")
+        return session
+
+    def evaluation_status(self) -> Optional[str]:
+        """Status of the queued evaluation ("pending", "running", "done", "failed"); picks up the result once done."""
+        if self.evaluation is not None:
+            return "done"
+        if self.evaluation_job is None:
+            return None
+        job = evaluation_queue.default_queue.status(self.evaluation_job)
+        if job is None:
+            return None
+        if job["status"] == "done":
+            self.evaluation = job["evaluation"]
+        return job["status"]
+
+    async def wait_for_evaluation(self, timeout: Optional[float] = None, poll: float = 0.2):
+        """Wait for the queued evaluation (headless runs); returns it, or None on failure / timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.evaluation_status() in ("pending", "running"):
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(poll)
+        return self.evaluation
+
+    async def step(self, user_input: str, emit: Optional[Callable[[Event], None]] = None) -> list:
+        """Advance the interview by one candidate message and return the events it produced."""
+        marks = [(self.stage, time.perf_counter())]
+        with metrics.span("turn", stage=self.stage):
+            events = []
+            try:
+                events = await self._step(user_input, emit, marks, events)
+            except Exception as e:
+                logger.exception("screening turn failed in stage %s", self.stage)
+                metrics.inc("turn_failures", stage=self.stage)
+                # The candidate sees an apology; headless callers look for the "error" event
+                failed = [Event("reply", UNAVAILABLE), Event("error", repr(e))]
+                events.extend(failed)
+                self.messages.append({"role": "assistant", "content": UNAVAILABLE})
+                if emit is not None:
+                    for event in failed:
+                        emit(event)
+        # Time spent in each stage this turn, including stages passed through
+        marks.append((None, time.perf_counter()))
+        for (stage, started), (_, ended) in zip(marks, marks[1:]):
+            metrics.observe("stage_seconds", ended - started, stage=stage)
+        return events
+
+    async def _step(self, user_input: str, emit: Optional[Callable[[Event], None]], marks: list, events: list) -> list:
+
+        def push(kind, content):
+            event = Event(kind, content)
+            events.append(event)
+            if kind in MESSAGE_KINDS:
+                self.messages.append({"role": "assistant", "content": content})
+            if emit is not None:
+                emit(event)
+
+        def move_to(stage):
+            self.stage = stage
+            marks.append((stage, time.perf_counter()))
+            push("stage", stage)
+
+        self.messages.append({"role": "user", "content": user_input})
+
+        if user_input == "exit":
+            push("reply", "Thank you for your time. Screening ended.")
+            return events
+
+        # --- STAGE 1: INFO COLLECTION ---
+        if self.stage == "INFO_COLLECTION":
+            info_agent_response, path = await run_blocking(
+                "info_collector", agents.info_collector.extract_info, user_input, dict(self.candidate_data)
+            )
+            self.extraction_paths.append(path)
+            self.candidate_data.update(info_agent_response)
+            await self._recognize()
+
+            if is_complete(self.candidate_data):
+                move_to("QUESTION_GENERATION")
+            else:
+                if not self._reusable():
+                    self._speculate_questions()
+                missing_labels = [FIELD_LABELS.get(f, f) for f in missing_fields(self.candidate_data)]
+                push("reply", (
+                    "Thank you.\n\n"
+                    "To continue, I still need the following details:\n"
+                    f"- {', '.join(missing_labels)}\n\n"
+                    "Please provide them in your next reply."
+                ))
+                return events
+
+        # --- STAGE 2: QUESTION GENERATION ---
+        if self.stage == "QUESTION_GENERATION":
+            # Candidate reads the instructions while questions are generated
+            push("notice", INSTRUCTIONS)
+
+            previous = self._reusable()
+            if previous and previous.get("questions"):
+                # Resume a recent, unfinished screening with the same questions
+                metrics.inc("returning_candidates", result="reused_questions")
+                if self._question_future is not None:
+                    self._question_future.cancel()
+                    self._question_future = self._question_key = None
+                result = {"questions": previous["questions"]}
+            else:
+                result = await self._take_speculative_questions()
+            if result is None and emit is not None:
+                # Interactive: stream the first question while the rest is generated
+                result = await run_streaming(
+                    "question_generator", agents.question_generator.question_generation_agent, dict(self.candidate_data),
+                    on_partial=lambda text: push("partial_question", text)
+                )
+            elif result is None:
+                result = await run_blocking(
+                    "question_generator", agents.question_generator.question_generation_agent, dict(self.candidate_data)
+                )
+            self.questions = result["questions"]
+            self.current_question_index = 0
+            self.answers = {}
+            self._answer_scores = {}
+            if self.reuse_previous:
+                await run_blocking(
+                    "candidate_index", candidate_index.default_index.remember, dict(self.candidate_data), self.questions
+                )
+            move_to("ASK_QUESTIONS")
+
+            push("reply", f"**Question 1 of {len(self.questions)}:**\n\n{self.questions[0]}")
+            return events
+
+        # --- STAGE 3: ASK QUESTIONS ---
+        if self.stage == "ASK_QUESTIONS":
+            current_q_text = self.questions[self.current_question_index]
+            self.answers[current_q_text] = user_input
+
+            self.current_question_index += 1
+            new_idx = self.current_question_index
+            if new_idx < len(self.questions):
+                # Score it in the background while the candidate reads the next question.
+                # The last answer is left to the evaluation job, which would otherwise wait on it.
+                self._answer_scores[current_q_text] = submit(
+                    "answer_scoring", agents.evaluator.answer_scoring_agent,
+                    dict(self.candidate_data), current_q_text, user_input
+                )
+                push("reply", f"**Question {new_idx + 1} of {len(self.questions)}:**\n\n{self.questions[new_idx]}")
+                return events
+            move_to("ASSESSMENT")
+
+        # --- STAGE 4: ASSESSMENT ---
+        if self.stage == "ASSESSMENT":
+            # The candidate does not see the evaluation, so it runs on the job queue after the closing message
+            record = self.result_record()
+            record["answer_scores"] = self._finished_answer_scores()
+            late = [q for q, future in self._answer_scores.items() if q not in record["answer_scores"]]
+            self.evaluation_job = evaluation_queue.default_queue.enqueue(
+                record, delay=evaluation_queue.SCORE_GRACE if late else 0.0
+            )
+            self._forward_late_scores(self.evaluation_job, late)
+            if self.reuse_previous:
+                await run_blocking("candidate_index", candidate_index.default_index.finish, dict(self.candidate_data))
+            metrics.inc("screenings_completed")
+            move_to("CONVO_END")
+
+        # --- STAGE 5: CONCLUSION ---
+        if self.stage == "CONVO_END":
+            push("reply", CLOSING)
+        return events
+
+    async def _recognize(self):
+        """
+        Once email or phone is known, look the candidate up (once). A contact
+        match is not verified, so it is never shown to the candidate and
+        nothing stored is copied into the profile; see _reusable(). The SQLite
+        lookup runs on the executor, off the event loop.
+        """
+        if not self.reuse_previous or self.returning is not None or not candidate_index.identity_keys(self.candidate_data):
+            return
+        record = await run_blocking("candidate_index", candidate_index.default_index.lookup, dict(self.candidate_data))
+        self.returning = record or {}
+        if record is not None:
+            metrics.inc("returning_candidates", result="recognized")
+
+    def _reusable(self) -> Optional[dict]:
+        """
+        The returning candidate's record if its screening is recent, unfinished
+        and was for the stack and YoE band typed in this session. Only the
+        question set is reused: it is not personal, and evaluations are always redone.
+        """
+        previous = self.returning
+        if not previous or not previous.get("fresh") or previous.get("finished"):
+            return None
+        if previous.get("signature") != question_cache.signature(self.candidate_data):
+            return None
+        return previous
+
+    def _speculate_questions(self):
+        """Start question generation in the background once its inputs are known."""
+        if any(self.candidate_data.get(field) in (None, [], "") for field in QUESTION_INPUTS):
+            return
+        key = question_cache.signature(self.candidate_data)
+        if self._question_future is not None:
+            if self._question_key == key:
+                return
+            # Inputs changed: drop the stale run (cancel only stops it if not started yet)
+            self._question_future.cancel()
+        self._question_future = submit(
+            "question_generator", agents.question_generator.question_generation_agent, dict(self.candidate_data)
+        )
+        self._question_key = key
+
+    async def _take_speculative_questions(self):
+        """Return the speculative result if it matches the final inputs, else None."""
+        future, key = self._question_future, self._question_key
+        self._question_future = self._question_key = None
+        if future is None or future.cancelled() or key != question_cache.signature(self.candidate_data):
+            metrics.inc("speculative_questions", result="missed")
+            return None
+        try:
+            result = await asyncio.wrap_future(future)
+        except Exception:
+            metrics.inc("speculative_questions", result="failed")
+            return None
+        metrics.inc("speculative_questions", result="used")
+        return result
+
+    def _forward_late_scores(self, job_id: int, questions: list):
+        """Hand scores still in flight to the queued job, and release it once the last one lands."""
+        if not questions:
+            return
+        remaining = set(questions)
+
+        def landed(question, future):
+            try:
+                if not future.cancelled() and future.exception() is None:
+                    evaluation_queue.default_queue.add_answer_score(job_id, question, future.result())
+            finally:
+                remaining.discard(question)
+                if not remaining:
+                    evaluation_queue.default_queue.release(job_id)
+
+        for q in questions:
+            self._answer_scores[q].add_done_callback(lambda future, q=q: landed(q, future))
+
+    def _finished_answer_scores(self) -> dict:
+        """Per-answer scores that are already in; the evaluation job scores the rest."""
+        return {
+            q: future.result()
+            for q, future in self._answer_scores.items()
+            if future.done() and not future.cancelled() and future.exception() is None
+        }
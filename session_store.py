@@ -0,0 +1,85 @@
+"""
+TalentScout Session Store - shared SQLite key-value store of session snapshots, so any replica can resume an interview
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+SESSIONS_PATH = os.getenv("TALENTSCOUT_SESSION_DB", "data/sessions.sqlite3")
+SESSION_TTL = int(os.getenv("TALENTSCOUT_SESSION_TTL", 7 * 24 * 3600))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    token TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL,
+    snapshot BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions (updated_at);
+"""
+
+
+def encode(snapshot: dict) -> bytes:
+    return zlib.compress(json.dumps(snapshot, separators=(",", ":")).encode())
+
+
+def decode(blob: bytes) -> dict:
+    return json.loads(zlib.decompress(blob))
+
+
+class SessionStore:
+    """
+    One row per interview token, overwritten after every turn. Snapshots are
+    small (compressed JSON), so the write is done inline before the reply is
+    shown; a replica that picks up the token next sees the latest turn.
+    """
+
+    def __init__(self, path: str = SESSIONS_PATH, ttl: int = SESSION_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def save(self, token: str, snapshot: dict):
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (token, updated_at, snapshot) VALUES (?, ?, ?)",
+                (token, time.time(), encode(snapshot)),
+            )
+
+    def load(self, token: str) -> dict | None:
+        """The latest snapshot for token, or None if unknown or expired."""
+        row = self._conn().execute(
+            "SELECT snapshot FROM sessions WHERE token = ? AND updated_at > ?", (token, time.time() - self.ttl)
+        ).fetchone()
+        return decode(row[0]) if row else None
+
+    def delete(self, token: str):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM sessions WHERE token = ?", (token,))
+
+    def prune(self) -> int:
+        """Drop expired snapshots; returns how many were removed."""
+        conn = self._conn()
+        with conn:
+            return conn.execute("DELETE FROM sessions WHERE updated_at <= ?", (time.time() - self.ttl,)).rowcount
+
+
+default_store = SessionStore()